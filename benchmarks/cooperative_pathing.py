@@ -0,0 +1,120 @@
+"""
+Benchmark of the cooperative (reservation table) pathfinder with 8, 32 and 128 crewmates moving at once.
+Run from the repository root: python benchmarks/cooperative_pathing.py
+"""
+import sys
+import time
+from os import path
+from random import Random
+
+sys.path.insert(0, path.abspath(path.join(path.dirname(__file__), "..")))
+
+from modules.misc.routing import RoutingTable
+from modules.misc.reservations import ReservationTable, cooperative_astar
+
+def build_grid_ship(rooms_x: int, rooms_y: int, room_size: int = 2) -> dict[tuple[int, int], list[tuple[int, int]]]:
+    """Build a navigation graph of a grid of square rooms, neighbouring rooms are connected by a single door."""
+    width = rooms_x * room_size
+    height = rooms_y * room_size
+    graph = {(x, y): [] for x in range(width) for y in range(height)}
+
+    for (x, y), neighbours in graph.items():
+        for nx, ny in ((x, y-1), (x, y+1), (x-1, y), (x+1, y)):
+            if (nx, ny) not in graph:
+                continue
+            same_room = nx // room_size == x // room_size and ny // room_size == y // room_size
+            # doors sit on the first row / collumn of every room wall
+            door = (nx != x and y % room_size == 0) or (ny != y and x % room_size == 0)
+            if same_room or door:
+                neighbours.append((nx, ny))
+
+    return graph
+
+def check_conflicts(paths: dict[int, list[tuple[int, int]]]) -> int:
+    """Count vertex and swap conflicts between timed paths (agents rest on their last node)."""
+    horizon = max(len(timed_path) for timed_path in paths.values())
+    conflicts = 0
+
+    for step in range(horizon):
+        positions = {}
+        for agent, timed_path in paths.items():
+            node = timed_path[min(step, len(timed_path) - 1)]
+            if node in positions:
+                conflicts += 1
+            positions[node] = agent
+
+        if step == 0:
+            continue
+        moves = set()
+        for timed_path in paths.values():
+            if step < len(timed_path) and timed_path[step - 1] != timed_path[step]:
+                moves.add((timed_path[step - 1], timed_path[step]))
+        conflicts += sum(1 for move in moves if move[::-1] in moves)
+
+    return conflicts
+
+def check_closed_door() -> None:
+    """Planning to a tile behind a closed door must fail cleanly instead of crashing on the missing distance."""
+    # two rooms of two tiles each, the door between tiles 1 and 2 is closed
+    graph = {0: [1], 1: [0], 2: [3], 3: [2]}
+    routing_table = RoutingTable(graph)
+    reservations = ReservationTable()
+
+    assert cooperative_astar(graph, 0, 3, 0, reservations, 0, routing_table.distance, routing_table=routing_table) is None
+    assert cooperative_astar(graph, 0, 1, 0, reservations, 0, routing_table.distance, routing_table=routing_table) == [0, 1]
+    print("closed door: unreachable goal returns None")
+
+def run(crew_size: int, window: int = 16, seed: int = 0) -> None:
+    rng = Random(seed)
+    graph = build_grid_ship(12, 12)
+    routing_table = RoutingTable(graph)
+    reservations = ReservationTable()
+
+    nodes = list(graph.keys())
+    starts = rng.sample(nodes, crew_size)
+    goals = rng.sample([node for node in nodes if node not in starts], crew_size)
+    idle = set(starts)
+
+    def plan(agent: int, start: tuple[int, int], now: int) -> list[tuple[int, int]]:
+        reservations.release(agent)
+        timed_path = cooperative_astar(graph, start, goals[agent], agent, reservations, now, routing_table.distance,
+                                       blocked=lambda node: node in idle, window=window, routing_table=routing_table)
+        if timed_path is None: # wait in place and try again on the next replan
+            timed_path = [start] * (window // 2 + 1)
+        reservations.reserve_path(agent, timed_path, now, window)
+        return timed_path
+
+    # every crewmate gets its order on the same frame
+    began = time.perf_counter()
+    plans = {}
+    for agent, start in enumerate(starts):
+        idle.discard(start)
+        plans[agent] = plan(agent, start, 0)
+    order_time = time.perf_counter() - began
+
+    # walk the crew one step at a time, replanning halfway through every window
+    history = {agent: [start] for agent, start in enumerate(starts)}
+    replan_time = 0
+    now = 0
+    while any(history[agent][-1] != goals[agent] for agent in history) and now < 2000:
+        now += 1
+        for agent, timed_path in plans.items():
+            history[agent].append(timed_path[1] if len(timed_path) > 1 else timed_path[0])
+            plans[agent] = timed_path[1:] if len(timed_path) > 1 else timed_path
+
+        if now % (window // 2) == 0:
+            began = time.perf_counter()
+            for agent in plans:
+                if history[agent][-1] != goals[agent]:
+                    plans[agent] = plan(agent, history[agent][-1], now)
+            replan_time += time.perf_counter() - began
+
+    arrived = sum(1 for agent in history if history[agent][-1] == goals[agent])
+    print(f"{crew_size:>4} crewmates: order {order_time*1000:8.2f} ms ({order_time*1000/crew_size:6.3f} ms/crewmate), "
+          f"replanning {replan_time*1000:8.2f} ms over {now} steps, "
+          f"{arrived}/{crew_size} arrived, {check_conflicts(history)} conflicts")
+
+if __name__ == "__main__":
+    check_closed_door()
+    for crew_size in (8, 32, 128):
+        run(crew_size)
@@ -0,0 +1,55 @@
+"""
+Benchmark of the memory held by crewmate sprites for crews of 1, 10 and 50.
+Compares one sprite sheet copy per crewmate (the previous Crewmate) with the race sheets shared by every crewmate now.
+Needs the game's textures in content/img, the measured sprite sheets are cut from the crewmate images there.
+Run from the repository root: python benchmarks/crew_memory.py
+"""
+import sys
+from os import path
+
+sys.path.insert(0, path.abspath(path.join(path.dirname(__file__), "..")))
+
+import pygame as pg
+
+def surface_bytes(surfaces: list[pg.Surface]) -> int:
+    """Return the pixel memory of the distinct surfaces in a list."""
+    unique = {id(surface): surface for surface in surfaces}
+    return sum(surface.get_pitch() * surface.get_height() for surface in unique.values())
+
+def sheet_images(sheet: dict) -> list[pg.Surface]:
+    """Return every frame image of a sprite sheet."""
+    frames = []
+    for value in sheet.values():
+        frames += [sprite.image for sprite in value] if isinstance(value, list) else [value.image]
+    return frames
+
+def measure(crew_size: int) -> tuple[int, int]:
+    """Spawn a crew on a ship, animate it for a second and return the sprite memory before and after."""
+    ship = Player()
+    crew = [Crewmate(f"crewmate {index}", ship, ship.rooms[index % len(ship.rooms)].rect.topleft, pg.sprite.Group()) for index in range(crew_size)]
+    for _ in range(60):
+        for crewmate in crew:
+            crewmate.update(1/60)
+
+    sheet = get_sprite_sheet(CrewmateRaces.HUMAN)
+    copies = surface_bytes(sheet_images(sheet)) * crew_size # what every Crewmate.__init__ used to copy
+    shared = surface_bytes(sheet_images(sheet) + [crewmate.image for crewmate in crew])
+    return copies, shared
+
+if __name__ == "__main__":
+    if not path.isdir(path.join(path.dirname(__file__), "..", "content", "img")):
+        print("Could not run benchmark: The textures in content/img are missing!")
+        sys.exit(1)
+
+    pg.init()
+    pg.display.set_mode((1, 1))
+
+    from modules.resources import load_textures, CrewmateRaces
+    from modules.player import Player
+    from modules.crewmate import Crewmate, get_sprite_sheet
+    load_textures()
+
+    print(f"{'crew':>6} {'copies':>12} {'shared':>12}")
+    for crew_size in (1, 10, 50):
+        copies, shared = measure(crew_size)
+        print(f"{crew_size:>6} {copies/1024:>10.1f}KB {shared/1024:>10.1f}KB")
@@ -0,0 +1,71 @@
+"""
+Benchmark of room adjacency and door tile detection on generated ships with 10, 100 and 1000 rooms.
+Compares the all-pairs room check with a closest-tile search (the previous place_doors / connect_rooms)
+with the sorted edge sweep used now.
+Run from the repository root: python benchmarks/room_adjacency.py
+"""
+import sys
+import time
+from os import path
+
+sys.path.insert(0, path.abspath(path.join(path.dirname(__file__), "..")))
+
+import pygame as pg
+
+from modules.misc.adjacency import find_adjacent_rects, shared_wall_tiles
+from modules.misc.ship_generator import generate_room_rects
+
+def generate_rooms(room_count: int, seed: int = 0) -> list[pg.Rect]:
+    """Return the room rects of a generated ship, in pixels."""
+    return [pg.Rect(x * 32, y * 32, w * 32, h * 32) for x, y, w, h in generate_room_rects(room_count, seed)]
+
+def all_pairs(rooms: list[pg.Rect]) -> list[tuple[int, int, tuple[tuple[int, int], tuple[int, int]]]]:
+    """The previous approach: compare every room with every room, then every tile with every tile."""
+    tiles = [
+        [(rect.x + x * 32 + 16, rect.y + y * 32 + 16) for x in range(rect.width // 32) for y in range(rect.height // 32)]
+        for rect in rooms
+        ]
+    doors = []
+
+    for i, room in enumerate(rooms):
+        for j, adj_room in enumerate(rooms):
+            if j <= i:
+                continue
+
+            touching_x = (room.left == adj_room.right or room.right == adj_room.left) and adj_room.top < room.bottom and adj_room.bottom > room.top
+            touching_y = (room.top == adj_room.bottom or room.bottom == adj_room.top) and adj_room.left < room.right and adj_room.right > room.left
+            if not touching_x and not touching_y:
+                continue
+
+            closest = None
+            for tile1 in tiles[i]:
+                for tile2 in tiles[j]:
+                    distance = abs(tile1[0] - tile2[0]) + abs(tile1[1] - tile2[1])
+                    if closest is None or distance < closest[0]:
+                        closest = (distance, tile1, tile2)
+
+            doors.append((i, j, (
+                ((closest[1][0] - room.x) // 32, (closest[1][1] - room.y) // 32),
+                ((closest[2][0] - adj_room.x) // 32, (closest[2][1] - adj_room.y) // 32)
+                )))
+
+    return doors
+
+def sweep(rooms: list[pg.Rect]) -> list[tuple[int, int, tuple[tuple[int, int], tuple[int, int]]]]:
+    """The sorted edge sweep, with the door tiles taken from the shared wall."""
+    return [(i, j, shared_wall_tiles(rooms[i], rooms[j])) for i, j, _ in find_adjacent_rects(rooms)]
+
+def measure(function, rooms: list[pg.Rect]) -> tuple[float, list]:
+    start = time.perf_counter()
+    result = function(rooms)
+    return time.perf_counter() - start, result
+
+if __name__ == "__main__":
+    print(f"{'rooms':>6} {'doors':>6} {'all pairs':>12} {'sweep':>12} {'speedup':>8}")
+    for room_count in (10, 100, 1000):
+        rooms = generate_rooms(room_count)
+        old_time, old_doors = measure(all_pairs, rooms)
+        new_time, new_doors = measure(sweep, rooms)
+        assert old_doors == new_doors, "the sweep placed different doors"
+
+        print(f"{room_count:>6} {len(new_doors):>6} {old_time*1000:>10.2f}ms {new_time*1000:>10.2f}ms {old_time/new_time:>7.1f}x")
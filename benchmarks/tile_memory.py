@@ -0,0 +1,43 @@
+"""
+Benchmark of the memory held by tile images on generated ships with 10, 100 and 1000 rooms.
+Compares one texture copy per tile (the previous Tile) with the shared tile texture used now.
+Needs the game's textures in content/img, the measured tile texture is loaded from there.
+Run from the repository root: python benchmarks/tile_memory.py
+"""
+import sys
+from os import path
+
+sys.path.insert(0, path.abspath(path.join(path.dirname(__file__), "..")))
+
+import pygame as pg
+
+def surface_bytes(surfaces: list[pg.Surface]) -> int:
+    """Return the pixel memory of the distinct surfaces in a list."""
+    unique = {id(surface): surface for surface in surfaces}
+    return sum(surface.get_pitch() * surface.get_height() for surface in unique.values())
+
+def measure(room_count: int) -> tuple[int, int, int]:
+    """Build a generated ship and return its tile count and the tile image memory before and after."""
+    ship = Player(register_generated_layout(room_count, 0))
+    tiles = [tile for room in ship.rooms for collumn in room.room_tile_layout for tile in collumn]
+
+    copies = [textures["tile_default"].copy() for _ in tiles] # what every Tile.__init__ used to allocate
+    return len(tiles), surface_bytes(copies), surface_bytes([tile.image for tile in tiles])
+
+if __name__ == "__main__":
+    if not path.isdir(path.join(path.dirname(__file__), "..", "content", "img")):
+        print("Could not run benchmark: The textures in content/img are missing!")
+        sys.exit(1)
+
+    pg.init()
+    pg.display.set_mode((1, 1))
+
+    from modules.resources import textures, load_textures
+    from modules.misc.ship_generator import register_generated_layout
+    from modules.player import Player
+    load_textures()
+
+    print(f"{'rooms':>6} {'tiles':>6} {'copies':>12} {'shared':>12} {'per tile':>10}")
+    for room_count in (10, 100, 1000):
+        tile_count, before, after = measure(room_count)
+        print(f"{room_count:>6} {tile_count:>6} {before/1024:>10.1f}KB {after/1024:>10.1f}KB {after/tile_count:>9.1f}B")
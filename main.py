@@ -43,9 +43,10 @@ class IntoTheLight:
         self.screen = pg.display.set_mode(self.resolution)
         pg.display.set_caption("IntoTheLight")
         load_textures()
+        load_fonts()
 
         self.player = Player()
-        self.display = Display(self.screen, self.resolution, float(CONFIG["ratio"]), self.player)
+        self.display = Display(self.screen, self.resolution, float(CONFIG["ratio"]), self.player, dirty_mode=CONFIG.get("dirty_rects", False))
         self.enemy = Enemy(screen_size=(self.resolution[0] * float(CONFIG["ratio"]), self.resolution[1]), offset=(self.resolution[0] * float(CONFIG["ratio"]),0))
         mouse_pos = (0,0)
 
@@ -85,8 +86,11 @@ class IntoTheLight:
             self.display.update()
             self.display.draw()
 
-            pg.display.flip()
-            self.screen.fill((0,0,0))
+            if self.display.dirty_mode: # only the changed areas are sent to the window
+                pg.display.update(self.display.dirty_rects)
+            else:
+                pg.display.flip()
+                self.screen.fill((0,0,0))
             dt = clock.tick(60) / 1000 # cap the game's framerate at 60 fps
         
     def enemy_controller(self) -> None:
@@ -107,7 +111,7 @@ class IntoTheLight:
                             del self.enemy
                             return
 
-                        case GameEvents.TOOK_DAMAGE: # TODO: send crew to the damaged system
+                        case GameEvents.TOOK_DAMAGE: # the crew is sent to repairs in Enemy.update
                             print("Enemy system took damage")
                             continue
                 self._enemy_events.revert_default()
@@ -143,6 +147,7 @@ if __name__ == "__main__":
     game_loop_thread.start()
 
     game_loop_thread.join()
+    game_instance.player.shutdown()
 
     pg.quit()  
     exit(0)
\ No newline at end of file
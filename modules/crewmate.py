@@ -1,14 +1,16 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Union
+from math import copysign
 from enum import Enum, auto
 import pygame as pg
 
 if TYPE_CHECKING:
     from modules.spaceship.spaceship import Spaceship
-    from modules.spaceship.tile import Tile
 
+from modules.spaceship.tile import Tile
 from modules.resources import CrewmateRaces, copy_sprites, GLOBAL_DEBUG_OPTIONS, textures
-from modules.misc.pathfinding import draw_path
+from modules.misc.pathfinding import draw_path, compress_path
+from modules.misc.dstar_lite import DStarLite
 
 class _CrewmateStates(Enum):
     IDLE = 0
@@ -19,32 +21,52 @@ class _CrewmateStates(Enum):
     BOARDING = auto()
     REPAIRING = auto()
 
+# the key of every state's frames in the sprite sheet
+_ANIM_KEYS = {state: state.name.lower() for state in _CrewmateStates}
+
+# one copy of every race's sprite sheet, shared by all crewmates of the race
+_sprite_sheets: dict[CrewmateRaces, dict[str, Union[pg.sprite.Sprite, list[pg.sprite.Sprite]]]] = {}
+
+def get_sprite_sheet(race: CrewmateRaces) -> dict[str, Union[pg.sprite.Sprite, list[pg.sprite.Sprite]]]:
+    """
+    Return the sprite sheet of a race, it's shared and must not be changed.
+    :param race: CrewmateRaces - the race
+    """
+    sheet = _sprite_sheets.get(race)
+    if sheet is None:
+        # copying the frames turns their colour key into transparency, the textures themselves draw it
+        sheet = _sprite_sheets[race] = copy_sprites(textures["crewmates"][race.name]["base"])
+    return sheet
+
 class Crewmate(pg.sprite.Sprite):
     # public
     name: str
-    rect: pg.Rect
-    hitbox: pg.Rect
+    rect: pg.Rect # in ship space
     race: CrewmateRaces
     moving_to: Union[Tile, None]
 
     selected: bool
     moving: bool
     boarding: bool
+    awaiting_path: bool
 
     # private
     _parent_ship : Spaceship
-    _sprite_sheet: dict[str, pg.sprite.Sprite]
-    _sprite: pg.sprite.Sprite
+    _sprite_sheet: dict[str, Union[pg.sprite.Sprite, list[pg.sprite.Sprite]]] # shared by the whole race, read only
     _enemy: bool
     _occupied_tile: Union[Tile, None]
     _movement_queue: list[Tile]
+    _subpixel: pg.math.Vector2
     _repair_progress: float
+    _wait_time: float
+    _replan_in: Union[int, None]
+    _planner: Union[DStarLite, None]
 
     _anim_frame: float
     _anim_state: _CrewmateStates
 
     # static variables
-    movement_speed: int = 1
+    movement_speed: int = 60 # pixels per second
     animation_speed: float = .1
     repairing_speed: float = .1
 
@@ -52,22 +74,18 @@ class Crewmate(pg.sprite.Sprite):
                  name: str,
                  parent_ship: Spaceship,
                  pos: tuple[int, int],
-                 offset = tuple[int, int],
                  sprite_group = pg.sprite.Group(),
                  race: CrewmateRaces = CrewmateRaces.HUMAN,
                  enemy: bool = False,
                  ) -> None:
         pg.sprite.Sprite.__init__(self, sprite_group)
 
-        self._sprite_sheet = copy_sprites(textures["crewmates"][race.name]["base"])
+        # the frames are only referenced, the crewmate just keeps its own rect
+        self._sprite_sheet = get_sprite_sheet(race)
 
-        self._sprite = self._sprite_sheet["idle"]
-
-        self.rect = self._sprite.rect
+        self.rect = self._sprite_sheet["idle"].rect.copy()
         self.rect.topleft = pos
-        self.image = self._sprite.image.copy()
-
-        self.hitbox = pg.Rect((pos[0] + offset[0], pos[1] + offset[1]), self._sprite.rect.size)
+        self.image = self._sprite_sheet["idle"].image
         
         self._parent_ship = parent_ship
         self._occupied_tile = None
@@ -78,9 +96,14 @@ class Crewmate(pg.sprite.Sprite):
         self.moving = False
         self.moving_to = None
         self.boarding = False
+        self.awaiting_path = False
         self._enemy = enemy
         self._movement_queue = []
+        self._subpixel = pg.math.Vector2()
         self._repair_progress = 0
+        self._wait_time = 0
+        self._replan_in = None
+        self._planner = None
 
         self._anim_state = _CrewmateStates.IDLE
         self._anim_frame = 0
@@ -91,20 +114,12 @@ class Crewmate(pg.sprite.Sprite):
             return
 
         if self.moving and self.moving_to is not None: # if the crewmate is moving, don't occupy any tiles
-            if len(self._movement_queue) > 0:
-                if self.rect.center == self._movement_queue[0].rect.center:
-                    del self._movement_queue[0]
-                else:
-                    x,y=0,0
-                    if self.rect.center[0] != self._movement_queue[0].rect.center[0]:
-                        x = self.movement_speed if self.rect.center[0] < self._movement_queue[0].rect.center[0] else -self.movement_speed
-                    if self.rect.center[1] != self._movement_queue[0].rect.center[1]:
-                        y = self.movement_speed if self.rect.center[1] < self._movement_queue[0].rect.center[1] else -self.movement_speed
-
-                    self._anim_moving((x,y))
-
-                    self.rect.move_ip(x,y)
-                    self.hitbox.move_ip(x,y)
+            if self._wait_time > 0: # waiting for another crewmate to pass
+                self._wait_time -= dt
+            elif len(self._movement_queue) > 0:
+                self._walk(self.movement_speed * dt)
+            elif self.awaiting_path: # the path service has not delivered the path yet
+                self._anim_idle()
             elif len(self._movement_queue) == 0: # check if the crewmate has reached the tile
                 self.moving = False
                 self.occupied_tile = self.moving_to
@@ -116,11 +131,10 @@ class Crewmate(pg.sprite.Sprite):
             for door in self._parent_ship.doors:
                 door.toggle() if pg.sprite.collide_circle_ratio(0.3)(self, door) else None
         else:
-            for room in self._parent_ship.rooms:
-                colliding_tile = pg.sprite.spritecollideany(self, room)
-                if colliding_tile is not None:
-                    self.occupied_tile = colliding_tile
-                    break
+            # the tile under the crewmate's center, a point is inside at most one tile
+            colliding_tiles = self._parent_ship.sprites_at(self.rect.center, Tile)
+            if len(colliding_tiles) > 0:
+                self.occupied_tile = colliding_tiles[0]
         
         if self.occupied_tile is not None:
             if self.occupied_tile.parent_room.needs_repair:
@@ -140,11 +154,16 @@ class Crewmate(pg.sprite.Sprite):
         # TODO: if self.hovering == True, draw an outline around the crewmate
         # TODO: if self.selected == True, draw an outline around the crewmate
 
-        screen.blit(self.image, self._sprite.rect)
+        view = self._parent_ship.transform
+        rect = view.to_view_rect(self.rect)
+        screen.blit(view.view_image(self.image), rect)
+
+        if self.awaiting_path:
+            pg.draw.rect(screen, (255,255,255), rect, 1)
 
         # draw the path the crewmate is taking
         if GLOBAL_DEBUG_OPTIONS["show_pathfinding"]:
-            draw_path(screen, self._movement_queue)
+            draw_path(screen, self._movement_queue, view)
 
     def check_hover(self, mouse_pos: tuple[int, int]) -> None:
         """
@@ -164,53 +183,241 @@ class Crewmate(pg.sprite.Sprite):
         else:
             self.selected = False
 
-    def move_to_tile(self, tile: Tile) -> None:
+    def move_to_tile(self, tile: Tile, path: list[Tile] = None) -> None:
         """
         Create a path to the tile and add it to the movement queue.
         :param tile: Tile - the tile the crewmate is moving to
+        :param path: list[Tile] - an already computed path to the tile (optional)
         """
+        redirected = self.moving
+        start_tile = self._current_tile()
+
+        if self.awaiting_path: # the previous order was not delivered yet
+            self._parent_ship.path_service.cancel(self)
+            self.awaiting_path = False
+
         self.moving = True
         self.selected = False
         self.moving_to = tile
         tile.selected = True
 
-        self._movement_queue = self._parent_ship.get_path_between_tiles(self.occupied_tile, tile)
+        self._replan_in = None
+        if path is None and self._parent_ship.cooperative_pathing:
+            path = self._parent_ship.get_cooperative_path(self, start_tile, tile)
+            self._replan_in = self._parent_ship.COOPERATIVE_WINDOW // 2
+        elif path is None and self._parent_ship.async_pathing:
+            self._parent_ship.request_path(self, start_tile, tile)
+            self.awaiting_path = True
+            path = [start_tile] if redirected else [] # finish the current step while waiting
+        elif path is None and (redirected or self._planner is not None):
+            path = self._plan_incrementally(start_tile, tile)
+        elif path is None:
+            path = self._parent_ship.get_path_between_tiles(start_tile, tile)
+        self._movement_queue = compress_path(path)
+
+        if self.occupied_tile is not None:
+            del self.occupied_tile
+
+        if len(path) == 0 and not self.awaiting_path: # the tile can't be reached
+            self._cancel_move(start_tile)
+
+    def path_ready(self, path: list[Tile]) -> None:
+        """
+        Receive a path requested from the ship's path service.
+        :param path: list[Tile] - the path to the tile the crewmate is moving to
+        """
+        if not self.awaiting_path:
+            return
+
+        self.awaiting_path = False
+        if len(path) == 0: # the tile can't be reached, stop on the tile the crewmate is on or stepping onto
+            self._cancel_move(self._movement_queue[-1] if len(self._movement_queue) > 0 else self._parent_ship.get_tile_at(self.rect.center))
+            return
+
+        self._movement_queue = compress_path(path)
+
+    def door_changed(self, tile1: Tile, tile2: Tile) -> None:
+        """
+        Repair the crewmate's path after the passability of the door between two tiles changed.
+        :param tile1: Tile - first tile connected by the door
+        :param tile2: Tile - second tile connected by the door
+        """
+        if self._planner is not None:
+            self._planner.update_edge(tile1, tile2)
+
+        if not self.moving or self.moving_to is None or self.awaiting_path:
+            return
+
+        current_tile = self._current_tile()
+        if self._replan_in is not None: # the reserved path may lead through the door
+            path = self._parent_ship.get_cooperative_path(self, current_tile, self.moving_to)
+            self._replan_in = self._parent_ship.COOPERATIVE_WINDOW // 2
+        else:
+            path = self._plan_incrementally(current_tile, self.moving_to)
+
+        if len(path) == 0: # the door cut the crewmate off from its tile
+            self._cancel_move(current_tile)
+        else:
+            self._movement_queue = compress_path(path)
+
+    def reset_planner(self) -> None:
+        """Drop the incremental planner, e.g. after the ship's navigation graph was rebuilt."""
+        self._planner = None
+
+    def _current_tile(self) -> Union[Tile, None]:
+        """Return the tile the crewmate is standing on or, while moving, the next tile it will reach."""
+        if self.occupied_tile is not None:
+            return self.occupied_tile
+        if self.moving and len(self._movement_queue) > 0:
+            return self._next_tile()
+        if self.moving:
+            return self.moving_to
+        return None
+
+    def _next_tile(self) -> Tile:
+        """Return the tile the crewmate is stepping onto on its way to the next waypoint."""
+        waypoint = self._movement_queue[0]
+        position = pg.math.Vector2(self.rect.center) + self._subpixel
+        dx = waypoint.rect.centerx - position.x
+        dy = waypoint.rect.centery - position.y
+        if dx == 0 and dy == 0:
+            return waypoint
+
+        # half a tile ahead lies inside the tile the crewmate is entering
+        probe = (
+            position.x + copysign(Tile.SIZE / 2, dx) if dx != 0 else position.x,
+            position.y + copysign(Tile.SIZE / 2, dy) if dy != 0 else position.y
+            )
+        tile = self._parent_ship.get_tile_at(probe)
+        return tile if tile is not None else waypoint
+
+    def _walk(self, distance: float) -> None:
+        """
+        Move along the waypoints, the distance left after reaching a waypoint carries over to the next one.
+        :param distance: float - the distance to move, in pixels
+        """
+        start = pg.math.Vector2(self.rect.center)
+        position = start + self._subpixel
+        heading = pg.math.Vector2()
+
+        while distance > 0 and len(self._movement_queue) > 0 and self._wait_time <= 0:
+            waypoint = self._movement_queue[0]
+            to_waypoint = pg.math.Vector2(waypoint.rect.center) - position
+
+            if to_waypoint.length() > 0:
+                heading = to_waypoint
+            if to_waypoint.length() > distance:
+                position += to_waypoint * (distance / to_waypoint.length())
+                break
+
+            distance -= to_waypoint.length()
+            position = pg.math.Vector2(waypoint.rect.center)
+            self._movement_queue.pop(0)
+            self._waypoint_reached(waypoint, max(1, round(to_waypoint.length() / Tile.SIZE)))
+
+        new_center = (round(position.x), round(position.y))
+        self._subpixel = position - pg.math.Vector2(new_center)
+        self.rect.move_ip(new_center[0] - start.x, new_center[1] - start.y)
+        self._parent_ship.index_sprite(self)
+
+        if heading.length() > 0:
+            self._anim_moving((int(copysign(1, heading.x)) if heading.x else 0, int(copysign(1, heading.y)) if heading.y else 0))
+
+    def _waypoint_reached(self, reached_tile: Tile, steps: int) -> None:
+        """
+        Handle reaching a waypoint.
+        :param reached_tile: Tile - the waypoint that was reached
+        :param steps: int - how many tiles the crewmate walked (or waited) to reach it
+        """
+        # cooperative paths are only reserved for a limited window, replan before it runs out
+        if self._replan_in is not None and len(self._movement_queue) > 0:
+            self._replan_in -= steps
+            if self._replan_in <= 0:
+                path = self._parent_ship.get_cooperative_path(self, reached_tile, self.moving_to)
+                if len(path) == 0: # the tile can't be reached anymore
+                    self._cancel_move(reached_tile)
+                    return
+                self._movement_queue = compress_path(path[1:])
+                self._replan_in = self._parent_ship.COOPERATIVE_WINDOW // 2
+
+        # a repeated tile means waiting on it for a step (cooperative pathing)
+        if len(self._movement_queue) > 0 and self._movement_queue[0] is reached_tile:
+            self._wait_time = Tile.SIZE / self.movement_speed
+
+    def _cancel_move(self, current_tile: Union[Tile, None]) -> None:
+        """
+        Drop the current order after no path to its tile was found. The crewmate stays on the tile it is standing on,
+        or finishes the step onto it first.
+        :param current_tile: Union[Tile, None] - the tile the crewmate is standing on or stepping onto
+        """
+        self.moving_to.selected = False
+        self.awaiting_path = False
+        self._replan_in = None
+        self._parent_ship.reservations.release(self)
+
+        if current_tile is not None and current_tile.rect.center != self.rect.center:
+            # walk back to the middle of the tile, it's occupied once it's reached
+            self.moving_to = current_tile
+            self._movement_queue = [current_tile]
+            return
+
+        self.moving = False
+        self.moving_to = None
+        self._movement_queue = []
+        self._wait_time = 0
+        if current_tile is not None:
+            self.occupied_tile = current_tile
+        self._anim_idle()
+
+    def _plan_incrementally(self, start_tile: Tile, end_tile: Tile) -> list[Tile]:
+        """
+        Get a path from the crewmate's incremental planner, reusing its previous search.
+        :param start_tile: Tile - the tile the path starts at
+        :param end_tile: Tile - the tile the path ends at
+        """
+        if self._planner is None:
+            self._planner = DStarLite(self._parent_ship.nav_graph, start_tile, end_tile, self._parent_ship.tile_distance)
+        else:
+            self._planner.set_start(start_tile)
+            self._planner.set_goal(end_tile)
 
-        del self.occupied_tile
+        path = self._planner.get_path()
+        return path if path is not None else []
 
     def _anim_idle(self) -> None:
         """
         Changes the sprite to the idle sprite.
         """
-        self.image = self._sprite_sheet["idle"].image.copy()
+        self.image = self._sprite_sheet["idle"].image
         self._anim_state = _CrewmateStates.IDLE
         self._anim_frame = 0
 
     def _anim_moving(self, movement_direction: tuple[int, int] ) -> None:
         """
         Changes the sprite to the moving sprite based on the movement direction.
-        :param movement_direction: tuple[int, int] - the direction the crewmate is moving
+        :param movement_direction: tuple[int, int] - the direction the crewmate is moving, as signs of x and y
         """
         new_anim_state = None
 
-        if movement_direction == (0, -self.movement_speed):
+        if movement_direction == (0, -1):
             new_anim_state = _CrewmateStates.MOVING_UP
-        elif movement_direction == (0, self.movement_speed):
+        elif movement_direction == (0, 1):
             new_anim_state = _CrewmateStates.MOVING_DOWN
-        elif movement_direction == (-self.movement_speed, 0):
+        elif movement_direction == (-1, 0):
             new_anim_state = _CrewmateStates.MOVING_LEFT
-        elif movement_direction == (self.movement_speed, 0):
+        elif movement_direction == (1, 0):
             new_anim_state = _CrewmateStates.MOVING_RIGHT
 
         if new_anim_state is not None and new_anim_state != self._anim_state:
             self._anim_state = new_anim_state
             self._anim_frame = 0
 
-            self.image = self._sprite_sheet[new_anim_state.name.lower()][self._anim_frame].image.copy()
+            self.image = self._sprite_sheet[_ANIM_KEYS[new_anim_state]][self._anim_frame].image
         elif new_anim_state == self._anim_state:
-            self._anim_frame = (self._anim_frame + self.animation_speed) % len(self._sprite_sheet[new_anim_state.name.lower()])
+            frames = self._sprite_sheet[_ANIM_KEYS[new_anim_state]]
+            self._anim_frame = (self._anim_frame + self.animation_speed) % len(frames)
 
-            self.image = self._sprite_sheet[new_anim_state.name.lower()][int(self._anim_frame)].image.copy()
+            self.image = frames[int(self._anim_frame)].image
         else:
             self._anim_idle()
 
@@ -224,13 +431,19 @@ class Crewmate(pg.sprite.Sprite):
         if self._anim_state != _CrewmateStates.REPAIRING:
             self._anim_state = _CrewmateStates.REPAIRING
             self._anim_frame = 0
-            self.image = self._sprite_sheet[self._anim_state.name.lower()][self._anim_frame].image.copy()
+            self.image = self._sprite_sheet[_ANIM_KEYS[self._anim_state]][self._anim_frame].image
         
-        self._anim_frame = (self._anim_frame + self.animation_speed) % len(self._sprite_sheet[self._anim_state.name.lower()])
-        self.image = self._sprite_sheet[self._anim_state.name.lower()][int(self._anim_frame)].image.copy()
+        frames = self._sprite_sheet[_ANIM_KEYS[self._anim_state]]
+        self._anim_frame = (self._anim_frame + self.animation_speed) % len(frames)
+        self.image = frames[int(self._anim_frame)].image
 
         return
     
+    @property
+    def hitbox(self) -> pg.Rect:
+        """The crewmate's rect on screen."""
+        return self._parent_ship.transform.to_screen_rect(self.rect)
+
     @property
     def occupied_tile(self) -> Union[Tile, None]:
         """Returns the tile the crewmate is currently occupying or None if moving."""
@@ -8,11 +8,17 @@ if TYPE_CHECKING:
 from modules.player import Player
 from modules.enemy import Enemy
 from modules.ui import InterfaceController
+from modules.spaceship.room import Room
 from modules.resources import GLOBAL_DEBUG_OPTIONS
 
 class Display:
     # public
     ratio: float
+    dirty_mode: bool # only redraw what changed and report it in dirty_rects, instead of redrawing the whole screen
+    dirty_rects: list[pg.Rect] # the areas of the screen changed by the last draw, in dirty mode
+
+    # if the changed areas cover more than this part of the screen, the whole screen is redrawn
+    DIRTY_AREA_LIMIT = 0.5
 
     # private
     _interface: InterfaceController
@@ -25,18 +31,31 @@ class Display:
     _player: Player
     _enemy: Union[Enemy, None]
 
+    _full_redraw: bool # the next frame redraws the whole screen, e.g. after the layout changed
+    _enemy_drawn: bool # if the enemy's side was shown in the last frame
+    _projectile_rects: dict[pg.Surface, list[pg.Rect]] # the projectiles drawn on the ship surfaces in the last frame
+    _screen_dirty: list[pg.Rect] # the areas of the screen to compose in the next draw
+
     def __init__(self, 
                  screen: pg.Surface, 
                  resolution: tuple[int, int],
                  ratio: float = 0.65, # player side / enemy side ratio
                  player: Player = None,
                  enemy: Enemy = None,
+                 dirty_mode: bool = False,
                  ) -> None:
 
         self._interface = InterfaceController(resolution, player, ratio=ratio, enemy=enemy)
         self._screen = screen
         self.ratio = ratio
 
+        self.dirty_mode = dirty_mode
+        self.dirty_rects = []
+        self._full_redraw = True
+        self._enemy_drawn = False
+        self._projectile_rects = {}
+        self._screen_dirty = []
+
         self._player = player
         self._player_screen = pg.Surface((
             screen.get_width() * self.ratio,
@@ -47,7 +66,7 @@ class Display:
         self._enemy_screen = None
         
         self.place_ship(self._player)
-        self._player.move_hitbox_by_distance((((self._screen.get_width() - self._player_screen.get_width()) // 2), 0))
+        self._player.transform.place_on_screen(((self._screen.get_width() - self._player_screen.get_width()) // 2, 0))
 
     def mouse_clicked(self, mouse_pos: tuple[int, int], mouse_clicked: tuple[bool, bool, bool]) -> None:
         """
@@ -67,7 +86,7 @@ class Display:
             crewmate.check_clicked(mouse_pos, mouse_clicked)
         
         if active_crewmate is not None:
-            for room in self._player.rooms:
+            for room in self._player.sprites_at(mouse_pos, Room, hitbox=True):
                 tile = room.check_clicked(mouse_pos, mouse_clicked)
 
                 if tile is not None:
@@ -108,30 +127,117 @@ class Display:
         """
         Update the display.
         """
+
+        if self.dirty_mode:
+            self._update_dirty()
+            return
         
         self._player.draw(self._player_screen)
 
         if self.enemy_ship is not None and self._interface.enemy_ui_active:
-            self._enemy_screen = pg.Surface((
-                self._screen.get_height(),
-                self._screen.get_width() * (1-self.ratio)
-                ))
+            # the enemy is rendered straight into its rotated view, the surface is reused every frame
             self.enemy_ship.draw(self._enemy_screen)
             self._player.draw_projectiles(self._player_screen, self._enemy_screen)
             self.enemy_ship.draw_projectiles(self._enemy_screen, self._player_screen)
-            self._enemy_screen = pg.transform.rotate(self._enemy_screen,90)
             
         self._interface.update()
 
+    def _update_dirty(self) -> None:
+        """
+        Update the display in dirty mode, the ship surfaces are kept between frames and only the changed areas are redrawn.
+        """
+
+        enemy_active = self.enemy_ship is not None and self._interface.enemy_ui_active
+        if enemy_active != self._enemy_drawn or GLOBAL_DEBUG_OPTIONS["show_hitboxes"] or GLOBAL_DEBUG_OPTIONS["show_pathfinding"]:
+            self._full_redraw = True # the debug overlays aren't tracked
+        self._enemy_drawn = enemy_active
+
+        views = [(self._player, self._player_screen, self._player_screen_pos())]
+        if enemy_active:
+            views.append((self.enemy_ship, self._enemy_screen, self._enemy_screen_pos()))
+
+        screen_dirty = []
+        for ship, surface, pos in views:
+            regions = ship.collect_dirty()
+            if regions is None or self._full_redraw:
+                regions = [surface.get_rect()]
+            else:
+                regions += self._projectile_rects.get(surface, [])
+
+            ship.draw(surface, regions)
+            screen_dirty += [region.move(pos) for region in regions]
+
+        self._projectile_rects = {}
+        if enemy_active:
+            drawn, enemy_drawn = self._player.draw_projectiles(self._player_screen, self._enemy_screen)
+            enemy_projectiles, player_projectiles = self.enemy_ship.draw_projectiles(self._enemy_screen, self._player_screen)
+            self._projectile_rects[self._player_screen] = drawn + player_projectiles
+            self._projectile_rects[self._enemy_screen] = enemy_drawn + enemy_projectiles
+
+            for surface, pos in ((self._player_screen, (0, 0)), (self._enemy_screen, views[1][2])):
+                screen_dirty += [rect.move(pos) for rect in self._projectile_rects[surface]]
+
+        self._interface.update()
+        screen_dirty += self._interface.dirty_rects
+        if enemy_active and self._interface.enemy_hud_dirty:
+            screen_dirty.append(self._interface.enemy_hud_rect.move(self._enemy_screen_pos()))
+
+        screen_rect = self._screen.get_rect()
+        screen_dirty = [rect.clip(screen_rect) for rect in screen_dirty]
+        screen_dirty = [rect for rect in screen_dirty if rect.width > 0 and rect.height > 0]
+        if self._full_redraw or sum(rect.width * rect.height for rect in screen_dirty) > screen_rect.width * screen_rect.height * self.DIRTY_AREA_LIMIT:
+            screen_dirty = [screen_rect]
+        self._screen_dirty = screen_dirty
+        self._full_redraw = False
+
     def draw(self) -> None:
         """
         Draw's the display contents on screen.
         """
         # TODO: Draw screen based if enemy ship is present or not
 
+        if self.dirty_mode:
+            self._draw_dirty()
+            return
+
+        self._compose()
+
+        self._player_screen.fill((0,0,0))
         if self.enemy_ship is not None and self._interface.enemy_ui_active:
-            self._interface.draw_enemy_interface(self._enemy_screen)
-            self._screen.blit(self._enemy_screen, (self._screen.get_width() * self.ratio, 0))
+            self._enemy_screen.fill((0,0,0))
+        
+        if GLOBAL_DEBUG_OPTIONS["show_hitboxes"]:
+            self.dev_draw_player_hitboxes()
+
+            for room in self._enemy.rooms:
+                pg.draw.rect(self._screen, (255,0,0), room.hitbox, 1)
+
+    def _draw_dirty(self) -> None:
+        """
+        Draw the areas of the screen that changed since the last frame, they're stored in dirty_rects.
+        """
+
+        for rect in self._screen_dirty:
+            self._screen.set_clip(rect)
+            self._screen.fill((0,0,0))
+            self._compose()
+        self._screen.set_clip(None)
+        self.dirty_rects = self._screen_dirty
+
+        if GLOBAL_DEBUG_OPTIONS["show_hitboxes"]:
+            self.dev_draw_player_hitboxes()
+
+            for room in self._enemy.rooms:
+                pg.draw.rect(self._screen, (255,0,0), room.hitbox, 1)
+
+    def _compose(self) -> None:
+        """
+        Put the ship surfaces and the interface together on the screen.
+        """
+
+        if self.enemy_ship is not None and self._interface.enemy_ui_active:
+            self._screen.blit(self._enemy_screen, self._enemy_screen_pos())
+            self._interface.draw_enemy_interface(self._screen, self._enemy_screen_pos())
 
             # draw border line between player / enemy cameras
             pg.draw.line(self._screen, (255,255,255), 
@@ -140,19 +246,18 @@ class Display:
                     2)
             self._screen.blit(self._player_screen, (0,0))
         else:
-            player_pos = ((self._screen.get_width() - self._player_screen.get_width()) // 2, 0)
-            self._screen.blit(self._player_screen, player_pos)     
+            self._screen.blit(self._player_screen, self._player_screen_pos())
         self._interface.draw(self._screen)
 
-        self._player_screen.fill((0,0,0))
-        if self.enemy_ship is not None and self._interface.enemy_ui_active:
-            self._enemy_screen.fill((0,0,0))
-        
-        if GLOBAL_DEBUG_OPTIONS["show_hitboxes"]:
-            self.dev_draw_player_hitboxes()
+    def _enemy_screen_pos(self) -> tuple[int, int]:
+        """Return the position of the enemy's surface on the screen."""
+        return (int(self._screen.get_width() * self.ratio), 0)
 
-            for room in self._enemy.rooms:
-                pg.draw.rect(self._screen, (255,0,0), room.hitbox, 1)
+    def _player_screen_pos(self) -> tuple[int, int]:
+        """Return the position of the player's surface on the screen."""
+        if self.enemy_ship is not None and self._interface.enemy_ui_active:
+            return (0, 0)
+        return ((self._screen.get_width() - self._player_screen.get_width()) // 2, 0)
 
     def place_ship(self, ship: Spaceship, enemy: bool = False, ratio: float = -1) -> None:
         """
@@ -184,8 +289,6 @@ class Display:
             new_center[1] - ship_center[1]
             ))
         ship.place_doors()
-        if ship.installed_shield is not None:
-            ship.installed_shield.post_init_update(ship.get_corners(), ship.get_center())
 
     def dev_draw_player_hitboxes(self) -> None:
         """
@@ -209,15 +312,19 @@ class Display:
         self._interface.enemy_ship = value
 
         self._enemy_screen = pg.Surface((
-            self._screen.get_height(),
-            self._screen.get_width() * (1-self.ratio)
+            self._screen.get_width() * (1-self.ratio),
+            self._screen.get_height()
             ))
 
         self.place_ship(self._enemy, True)
-        self._player.move_hitbox_by_distance((-((self._screen.get_width() - self._player_screen.get_width()) // 2), 0))
+        self._player.transform.place_on_screen((0, 0))
+        self._full_redraw = True
 
     @enemy_ship.deleter
     def enemy_ship(self) -> None:
+        if self._enemy is not None:
+            self._enemy.shutdown()
         self._enemy = None
-        self._player.move_hitbox_by_distance((((self._screen.get_width() - self._player_screen.get_width()) // 2), 0))
-        del self._interface.enemy_ship
\ No newline at end of file
+        self._player.transform.place_on_screen(((self._screen.get_width() - self._player_screen.get_width()) // 2, 0))
+        del self._interface.enemy_ship
+        self._full_redraw = True
\ No newline at end of file
@@ -7,6 +7,7 @@ if TYPE_CHECKING:
 
 from modules.spaceship.spaceship import Spaceship
 from modules.spaceship.room import Room
+from modules.resources import GameEvents
 
 from random import randint
 
@@ -29,15 +30,43 @@ class Enemy(Spaceship):
 
     enemy = True
 
+    # private
+    _aimed_room: Union[Room, None]
+
     def __init__(self, 
                  ship_type: str = "cruiser",
                  screen_size: tuple[int, int] = (800, 600),
                  offset: tuple[int, int] = (0,0),
                  ) -> None:
+        self._aimed_room = None
         super().__init__(ship_type, screen_size, True, offset)
 
         self.hull_hp = randint(6,20)
     
+    def update(self, dt: float) -> list[GameEvents]:
+        events = super().update(dt)
+
+        if events is not None and GameEvents.TOOK_DAMAGE in events:
+            self.send_crew_to_repairs()
+
+        return events
+
+    def send_crew_to_repairs(self) -> None:
+        """Send the idle crewmates to the damaged systems as a group, they all follow the system's flow field."""
+        idle_crewmates = [
+            crewmate for crewmate in self.crewmates
+            if not crewmate.moving and crewmate.occupied_tile is not None and not crewmate.occupied_tile.parent_room.needs_repair
+            ]
+
+        for system in self.damaged_systems:
+            if len(idle_crewmates) == 0:
+                return
+
+            sent = self.send_crewmates_to_room(idle_crewmates, system)
+            idle_crewmates = [crewmate for crewmate in idle_crewmates if crewmate not in sent]
+
+        return
+
     def select_room(self, mouse_pos: tuple[int, int], mouse_clicked: tuple[bool, bool, bool]) -> Union[Room, None]:
         """
         Select a room if the cursor is hovering over it.
@@ -48,13 +77,13 @@ class Enemy(Spaceship):
         if self.destroyed:
             return None
 
-        for room in self.rooms:
-            room.aimed_at = False
-            if room.hitbox.collidepoint(mouse_pos):
-                # TODO: Add an icon to show that the room is being targeted
-                return room
-        
-        return None
+        if self._aimed_room is not None:
+            self._aimed_room.aimed_at = False
+            self._aimed_room = None
+
+        rooms = self.sprites_at(mouse_pos, Room, hitbox=True)
+        # TODO: Add an icon to show that the room is being targeted
+        return rooms[0] if len(rooms) > 0 else None
 
     def hover_weapon(self, mouse_pos: tuple[int, int]) -> None:
         """
@@ -64,10 +93,13 @@ class Enemy(Spaceship):
         if self.destroyed:
             return
 
-        for room in self.rooms:
-            room.aimed_at = False
-            if room.hitbox.collidepoint(mouse_pos):
-                room.aimed_at = True
+        if self._aimed_room is not None:
+            self._aimed_room.aimed_at = False
+            self._aimed_room = None
+
+        for room in self.sprites_at(mouse_pos, Room, hitbox=True):
+            room.aimed_at = True
+            self._aimed_room = room
         
         return
     
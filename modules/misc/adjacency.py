@@ -0,0 +1,72 @@
+import pygame as pg
+
+def find_adjacent_rects(rects: list[pg.Rect]) -> list[tuple[int, int, bool]]:
+    """
+    Find the pairs of rects that share a wall, with a sorted sweep over their edges.
+    Edges are grouped by their coordinate and the two sides of every group are merged by position,
+    so only rects that actually touch are ever compared.
+    :param rects: list[pg.Rect] - the rects (rooms) to check
+    :return: list[tuple[int, int, bool]] - (index1, index2, vertical) for every touching pair, index1 < index2,
+        vertical is True if the shared wall is vertical (the rects are next to each other)
+    """
+
+    pairs = []
+
+    # vertical walls are right edges meeting left edges, horizontal walls bottom edges meeting top edges
+    for vertical in (True, False):
+        closing = {}
+        opening = {}
+        for index, rect in enumerate(rects):
+            if vertical:
+                closing.setdefault(rect.right, []).append((rect.top, rect.bottom, index))
+                opening.setdefault(rect.left, []).append((rect.top, rect.bottom, index))
+            else:
+                closing.setdefault(rect.bottom, []).append((rect.left, rect.right, index))
+                opening.setdefault(rect.top, []).append((rect.left, rect.right, index))
+
+        for coordinate, ending in closing.items():
+            starting = opening.get(coordinate)
+            if starting is None:
+                continue
+
+            ending.sort()
+            starting.sort()
+            _merge_overlaps(ending, starting, vertical, pairs)
+
+    pairs.sort()
+    return pairs
+
+def _merge_overlaps(first: list[tuple[int, int, int]], second: list[tuple[int, int, int]], vertical: bool, pairs: list[tuple[int, int, bool]]) -> None:
+    """Append every strictly overlapping pair of segments from two sorted lists of (start, end, index)."""
+    j = 0
+    for start, end, index in first:
+        # segments of the second list that end before this one starts can't overlap any later segment either
+        while j < len(second) and second[j][1] <= start:
+            j += 1
+
+        k = j
+        while k < len(second) and second[k][0] < end:
+            if second[k][1] > start:
+                other = second[k][2]
+                pairs.append((min(index, other), max(index, other), vertical))
+            k += 1
+
+def shared_wall_tiles(rect1: pg.Rect, rect2: pg.Rect, tile_size: int = 32) -> tuple[tuple[int, int], tuple[int, int]]:
+    """
+    Return the tiles on both sides of the start of the wall two touching rects share.
+    :param rect1: pg.Rect - the first rect
+    :param rect2: pg.Rect - the second rect
+    :param tile_size: int - the size of a tile in pixels
+    :return: tuple[tuple[int, int], tuple[int, int]] - the (x, y) tile positions inside rect1 and rect2
+    """
+
+    if rect1.right == rect2.left or rect1.left == rect2.right:
+        top = max(rect1.top, rect2.top)
+        x1 = rect1.width // tile_size - 1 if rect1.right == rect2.left else 0
+        x2 = 0 if rect1.right == rect2.left else rect2.width // tile_size - 1
+        return (x1, (top - rect1.top) // tile_size), (x2, (top - rect2.top) // tile_size)
+
+    left = max(rect1.left, rect2.left)
+    y1 = rect1.height // tile_size - 1 if rect1.bottom == rect2.top else 0
+    y2 = 0 if rect1.bottom == rect2.top else rect2.height // tile_size - 1
+    return ((left - rect1.left) // tile_size, y1), ((left - rect2.left) // tile_size, y2)
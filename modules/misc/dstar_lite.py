@@ -0,0 +1,183 @@
+from __future__ import annotations
+from typing import Union, Callable, Hashable
+from heapq import heappush, heappop
+from itertools import count
+
+_INFINITY = float("inf")
+
+class _VirtualGoal:
+    """Virtual search root connected to the current goal, changing the goal is just an edge change."""
+
+    def __repr__(self) -> str:
+        return "<virtual goal>"
+
+class DStarLite:
+    """
+    Incremental planner (D* Lite) over a navigation graph with unit edge costs.
+    The search runs backwards from the goal, so the agent moving, doors changing and the goal
+    being moved only repair the part of the search that was affected.
+    """
+
+    # public
+    start: Hashable
+    goal: Hashable
+
+    # private
+    _graph: dict[Hashable, list[Hashable]]
+    _heuristic: Callable[[Hashable, Hashable], float]
+    _root: _VirtualGoal
+    _g: dict[Hashable, float]
+    _rhs: dict[Hashable, float]
+    _queue: list[tuple[float, float, int, Hashable]]
+    _queued: dict[Hashable, tuple[float, float]]
+    _tie_breaker: count
+    _km: float
+    _last_start: Hashable
+
+    def __init__(self, graph: dict[Hashable, list[Hashable]], start: Hashable, goal: Hashable, heuristic: Callable[[Hashable, Hashable], float]) -> None:
+        """
+        :param graph: dict[Hashable, list[Hashable]] - the navigation graph, shared and updated by its owner
+        :param start: Hashable - the node the agent is on
+        :param goal: Hashable - the node the agent wants to reach
+        :param heuristic: Callable - admissible distance estimate between two nodes
+        """
+        self._graph = graph
+        self._heuristic = heuristic
+        self._root = _VirtualGoal()
+        self._g = {}
+        self._rhs = {self._root: 0}
+        self._queue = []
+        self._queued = {}
+        self._tie_breaker = count()
+        self._km = 0
+
+        self.start = start
+        self.goal = goal
+        self._last_start = start
+
+        self._push(self._root, self._calculate_key(self._root))
+
+    def get_path(self) -> Union[list[Hashable], None]:
+        """
+        Repair the search if needed and return the path from the start to the goal.
+        :return: Union[list[Hashable], None] - the path including both ends or None if the goal is unreachable
+        """
+        self._compute_shortest_path()
+
+        if self._g.get(self.start, _INFINITY) == _INFINITY:
+            return None
+
+        path = [self.start]
+        node = self.start
+        while node != self.goal:
+            node = min(self._graph[node], key=lambda successor: self._g.get(successor, _INFINITY))
+            if self._g.get(node, _INFINITY) == _INFINITY or len(path) > len(self._graph):
+                return None
+            path.append(node)
+
+        return path
+
+    def set_start(self, start: Hashable) -> None:
+        """
+        Move the agent, the search state stays valid.
+        :param start: Hashable - the node the agent is on now
+        """
+        self.start = start
+
+    def set_goal(self, goal: Hashable) -> None:
+        """
+        Change the goal by moving the edge to the virtual search root.
+        :param goal: Hashable - the new goal
+        """
+        if goal == self.goal:
+            return
+
+        self._begin_change()
+        previous_goal = self.goal
+        self.goal = goal
+        self._update_vertex(previous_goal)
+        self._update_vertex(goal)
+
+    def update_edge(self, node1: Hashable, node2: Hashable) -> None:
+        """
+        Repair the search after the edge between two nodes was added to or removed from the graph.
+        :param node1: Hashable - first end of the edge
+        :param node2: Hashable - second end of the edge
+        """
+        self._begin_change()
+        self._update_vertex(node1)
+        self._update_vertex(node2)
+
+    def _begin_change(self) -> None:
+        """Account for the distance the agent moved since the last change (keeps the queued keys valid)."""
+        self._km += self._heuristic(self._last_start, self.start)
+        self._last_start = self.start
+
+    def _successors(self, node: Hashable) -> list[tuple[Hashable, float]]:
+        if node is self._root:
+            return []
+
+        successors = [(successor, 1) for successor in self._graph[node]]
+        if node == self.goal:
+            successors.append((self._root, 0))
+        return successors
+
+    def _predecessors(self, node: Hashable) -> list[Hashable]:
+        if node is self._root:
+            return [self.goal]
+        return self._graph[node]
+
+    def _calculate_key(self, node: Hashable) -> tuple[float, float]:
+        value = min(self._g.get(node, _INFINITY), self._rhs.get(node, _INFINITY))
+        estimate = 0 if node is self._root else self._heuristic(self.start, node)
+        return (value + estimate + self._km, value)
+
+    def _update_vertex(self, node: Hashable) -> None:
+        if node is not self._root:
+            self._rhs[node] = min(
+                (cost + self._g.get(successor, _INFINITY) for successor, cost in self._successors(node)),
+                default=_INFINITY
+                )
+
+        self._queued.pop(node, None)
+        if self._g.get(node, _INFINITY) != self._rhs.get(node, _INFINITY):
+            self._push(node, self._calculate_key(node))
+
+    def _push(self, node: Hashable, key: tuple[float, float]) -> None:
+        self._queued[node] = key
+        heappush(self._queue, (key[0], key[1], next(self._tie_breaker), node))
+
+    def _top(self) -> Union[tuple[tuple[float, float], Hashable], None]:
+        """Return the smallest valid queue entry, dropping stale ones."""
+        while self._queue:
+            k1, k2, _, node = self._queue[0]
+            if self._queued.get(node) == (k1, k2):
+                return (k1, k2), node
+            heappop(self._queue)
+        return None
+
+    def _compute_shortest_path(self) -> None:
+        while True:
+            top = self._top()
+            start_key = self._calculate_key(self.start)
+            if (top is None or top[0] >= start_key) and self._rhs.get(self.start, _INFINITY) == self._g.get(self.start, _INFINITY):
+                return
+            if top is None:
+                return
+
+            old_key, node = top
+            heappop(self._queue)
+            del self._queued[node]
+
+            new_key = self._calculate_key(node)
+            if old_key < new_key:
+                self._push(node, new_key)
+            elif self._g.get(node, _INFINITY) > self._rhs.get(node, _INFINITY):
+                self._g[node] = self._rhs[node]
+                for predecessor in self._predecessors(node):
+                    self._update_vertex(predecessor)
+            else:
+                self._g[node] = _INFINITY
+                self._update_vertex(node)
+                for predecessor in self._predecessors(node):
+                    self._update_vertex(predecessor)
@@ -0,0 +1,134 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Union, Hashable
+from concurrent.futures import ThreadPoolExecutor, Future
+from collections import deque
+
+if TYPE_CHECKING:
+    from modules.spaceship.tile import Tile
+    from modules.crewmate import Crewmate
+
+class NavSnapshot:
+    """Immutable copy of a navigation graph, tiles are replaced by indices so workers never touch sprites."""
+
+    # public
+    version: int
+    tiles: tuple[Tile, ...]
+    index: dict[Tile, int]
+    adjacency: tuple[tuple[int, ...], ...]
+
+    def __init__(self, graph: dict[Tile, list[Tile]], version: int) -> None:
+        """
+        :param graph: dict[Tile, list[Tile]] - the navigation graph to copy
+        :param version: int - the version of the graph the snapshot was taken from
+        """
+        self.version = version
+        self.tiles = tuple(graph.keys())
+        self.index = {tile: index for index, tile in enumerate(self.tiles)}
+        self.adjacency = tuple(tuple(self.index[neighbour] for neighbour in graph[tile]) for tile in self.tiles)
+
+def solve_snapshot_path(adjacency: tuple[tuple[int, ...], ...], start: int, end: int) -> Union[tuple[int, ...], None]:
+    """
+    Find the shortest path between two indices of a snapshot, safe to run on any thread.
+    :param adjacency: tuple[tuple[int, ...], ...] - the snapshot's adjacency
+    :param start: int - the start index
+    :param end: int - the end index
+    :return: Union[tuple[int, ...], None] - the path including both ends or None if there is none
+    """
+    parents = {start: None}
+    queue = deque((start,))
+
+    while queue:
+        current = queue.popleft()
+        if current == end:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = parents[current]
+            return tuple(reversed(path))
+
+        for neighbour in adjacency[current]:
+            if neighbour not in parents:
+                parents[neighbour] = current
+                queue.append(neighbour)
+
+    return None
+
+class PathService:
+    """
+    Solves path requests on a worker pool against a snapshot of the navigation graph.
+    Results are handed to the requesting crewmates when deliver() is called on a later tick.
+    """
+
+    # private
+    _executor: ThreadPoolExecutor
+    _snapshot: Union[NavSnapshot, None]
+    _pending: dict[Hashable, tuple[Future, NavSnapshot, Tile, Tile]]
+
+    def __init__(self, max_workers: int = 2) -> None:
+        """
+        :param max_workers: int - the number of worker threads
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="path_service")
+        self._snapshot = None
+        self._pending = {}
+
+    def request(self, crewmate: Crewmate, start_tile: Tile, end_tile: Tile, graph: dict[Tile, list[Tile]], version: int) -> None:
+        """
+        Queue a path request, a previous request of the same crewmate is dropped.
+        :param crewmate: Crewmate - the crewmate the path is for
+        :param start_tile: Tile - the start tile
+        :param end_tile: Tile - the end tile
+        :param graph: dict[Tile, list[Tile]] - the current navigation graph
+        :param version: int - the version of the navigation graph
+        """
+        if self._snapshot is None or self._snapshot.version != version:
+            self._snapshot = NavSnapshot(graph, version)
+        snapshot = self._snapshot
+
+        old_request = self._pending.pop(crewmate, None)
+        if old_request is not None:
+            old_request[0].cancel()
+
+        if start_tile not in snapshot.index or end_tile not in snapshot.index: # delivered as "no path" on the next tick
+            future = Future()
+            future.set_result(None)
+        else:
+            future = self._executor.submit(solve_snapshot_path, snapshot.adjacency, snapshot.index[start_tile], snapshot.index[end_tile])
+        self._pending[crewmate] = (future, snapshot, start_tile, end_tile)
+
+    def cancel(self, crewmate: Crewmate) -> None:
+        """
+        Drop the pending request of a crewmate.
+        :param crewmate: Crewmate - the crewmate
+        """
+        request = self._pending.pop(crewmate, None)
+        if request is not None:
+            request[0].cancel()
+
+    def deliver(self, graph: dict[Tile, list[Tile]], version: int) -> None:
+        """
+        Hand the finished paths to their crewmates. Requests solved on an outdated snapshot are queued again.
+        :param graph: dict[Tile, list[Tile]] - the current navigation graph
+        :param version: int - the version of the navigation graph
+        """
+        for crewmate, (future, snapshot, start_tile, end_tile) in list(self._pending.items()):
+            if not future.done():
+                continue
+            del self._pending[crewmate]
+
+            if snapshot.version != version:
+                self.request(crewmate, start_tile, end_tile, graph, version)
+                continue
+
+            result = future.result()
+            crewmate.path_ready([snapshot.tiles[index] for index in result] if result is not None else [])
+
+    def shutdown(self) -> None:
+        """Stop the worker pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
+
+    @property
+    def pending(self) -> int:
+        """Return the number of requests that were not delivered yet."""
+        return len(self._pending)
@@ -1,10 +1,19 @@
-from typing import Self
+from typing import Self, Callable, Hashable, Iterable, Iterator, TypeVar
+from heapq import heappush, heappop
+from itertools import count
 
 import pygame as pg
 
+T = TypeVar("T", bound=Hashable)
+
+# Adjacent tiles (but only up, down, left, right)
+_NEIGHBOURS = ((0, -1), (0, 1), (-1, 0), (1, 0))
+
 class Node:
     """A node class for A* Pathfinding"""
 
+    __slots__ = ("parent", "position", "g", "h", "f")
+
     def __init__(self, parent: Self=None, position: tuple[int, int]=None):
         self.parent = parent
         self.position = position
@@ -15,92 +24,111 @@ class Node:
 
     def __eq__(self, other: Self) -> bool:
         return self.position == other.position
-    
-def astar_pathfinding(map, start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
-    """Returns a list of tuples as a path from the given start to the given end in the given map"""
-    
-    # Create start and end node
+
+def manhattan_distance(a: tuple[int, int], b: tuple[int, int]) -> int:
+    """Returns the manhattan distance between two positions (admissible for 4-way movement)."""
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+def astar_search(start: T, end: T, neighbours: Callable[[T], Iterable[T]], heuristic: Callable[[T, T], float]) -> list[T]:
+    """
+    Returns a list of nodes as a path from the given start to the given end, every step has a cost of 1.
+    :param start: T - the start node
+    :param end: T - the end node
+    :param neighbours: Callable[[T], Iterable[T]] - returns the nodes that can be reached from a node
+    :param heuristic: Callable[[T, T], float] - admissible estimate of the cost between two nodes
+    """
+
+    # Create start node
     start_node = Node(None, start)
-    start_node.g = start_node.h = start_node.f = 0
-    end_node = Node(None, end)
-    end_node.g = end_node.h = end_node.f = 0
-    
-    # Initialize both open and closed list
-    open_list = []
-    closed_list = []
-    
-    # Add the start node
-    open_list.append(start_node)
-    
+    start_node.h = start_node.f = heuristic(start, end)
+
+    # open set is a binary heap ordered by f, ties broken by h and then insertion order
+    tie_breaker = count()
+    open_heap = [(start_node.f, start_node.h, next(tie_breaker), start_node)]
+    best_g = {start: 0}
+    closed_set = set()
+
     # Loop until you find the end
-    while len(open_list) > 0:
-        # Get the current node
-        current_node = open_list[0]
-        current_index = 0
-        for index, item in enumerate(open_list):
-            if item.f < current_node.f:
-                current_node = item
-                current_index = index
-        
-        # Pop current off open list, add to closed list
-        open_list.pop(current_index)
-        closed_list.append(current_node)
-        
+    while open_heap:
+        current_node = heappop(open_heap)[3]
+        position = current_node.position
+
+        # skip stale heap entries of already expanded nodes
+        if position in closed_set:
+            continue
+        closed_set.add(position)
+
         # Found the goal
-        if current_node == end_node:
+        if position == end:
             path = []
             current = current_node
             while current is not None:
                 path.append(current.position)
                 current = current.parent
             return path[::-1] # Return reversed path
-        
-        # Generate children
-        children = []
-        for new_position in [(0, -1), (0, 1), (-1, 0), (1, 0)]: # Adjacent tiles (but only up, down, left, right) 
-            
-            # Get node position
-            node_position = (current_node.position[0] + new_position[0], current_node.position[1] + new_position[1])
-            
-            # Make sure within range
-            if node_position[0] > (len(map) - 1) or node_position[0] < 0 or node_position[1] > (len(map[len(map)-1]) -1) or node_position[1] < 0:
-                continue
-            
-            # Make sure walkable terrain
-            if map[node_position[0]][node_position[1]] != 1:
+
+        g = current_node.g + 1
+        for neighbour in neighbours(position):
+            # Child is already closed or reachable with a lower cost
+            if neighbour in closed_set or best_g.get(neighbour, g + 1) <= g:
                 continue
-            
-            # Create new node
-            new_node = Node(current_node, node_position)
-            
-            # Append
-            children.append(new_node)
-
-        # Loop through children
-        for child in children:
-            
-            # Child is on the closed list
-            for closed_child in closed_list:
-                if child == closed_child:
-                    continue
-            
-            # Create the f, g, and h values
-            child.g = current_node.g + 1
-            child.h = ((child.position[0] - end_node.position[0]) ** 2) + ((child.position[1] - end_node.position[1]) ** 2)
+            best_g[neighbour] = g
+
+            child = Node(current_node, neighbour)
+            child.g = g
+            child.h = heuristic(neighbour, end)
             child.f = child.g + child.h
-            
-            # Child is already in the open list
-            for open_node in open_list:
-                if child == open_node and child.g > open_node.g:
-                    continue
-            
-            # Add the child to the open list
-            open_list.append(child)
-
-def draw_path(screen, path):
+
+            heappush(open_heap, (child.f, child.h, next(tie_breaker), child))
+
+    # no path was found
+    return None
+
+def astar_pathfinding(map, start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
+    """Returns a list of tuples as a path from the given start to the given end in the given map"""
+
+    width = len(map)
+    if width == 0:
+        return None
+    height = len(map[width-1])
+
+    def walkable_neighbours(position: tuple[int, int]) -> Iterator[tuple[int, int]]:
+        for offset in _NEIGHBOURS:
+            node_position = (position[0] + offset[0], position[1] + offset[1])
+
+            # Make sure within range and walkable terrain
+            if 0 <= node_position[0] < width and 0 <= node_position[1] < height and map[node_position[0]][node_position[1]] == 1:
+                yield node_position
+
+    return astar_search(tuple(start), tuple(end), walkable_neighbours, manhattan_distance)
+
+def compress_path(path: list[pg.sprite.Sprite]) -> list[pg.sprite.Sprite]:
+    """
+    Compress a tile path into waypoints, keeping only the tiles where the path turns.
+    Repeated tiles (waits) are kept, so timed paths keep their timing.
+    :param path: list[pg.sprite.Sprite] - the path, every step is a neighbouring tile
+    """
+
+    if len(path) <= 2:
+        return path[:]
+
+    def direction(a: pg.sprite.Sprite, b: pg.sprite.Sprite) -> tuple[int, int]:
+        return (b.rect.centerx - a.rect.centerx, b.rect.centery - a.rect.centery)
+
+    waypoints = [path[0]]
+    for index in range(1, len(path)-1):
+        incoming = direction(path[index-1], path[index])
+        outgoing = direction(path[index], path[index+1])
+        if incoming != outgoing or incoming == (0, 0):
+            waypoints.append(path[index])
+    waypoints.append(path[-1])
+
+    return waypoints
+
+def draw_path(screen, path, view):
     for index, tile in enumerate(path):
         if index == len(path)-1:
             break
         
-        pg.draw.line(screen, (0,0,255), tile.hitbox.center, path[index+1].hitbox.center, 2)
+        pg.draw.line(screen, (0,0,255), view.to_view_rect(tile.rect).center, view.to_view_rect(path[index+1].rect).center, 2)
         
\ No newline at end of file
@@ -0,0 +1,224 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Union, Callable, Hashable
+from heapq import heappush, heappop
+from itertools import count
+
+if TYPE_CHECKING:
+    from modules.misc.routing import RoutingTable
+
+class ReservationTable:
+    """
+    Space-time reservation table for cooperative pathfinding.
+    Time is measured in steps, one step being the time a crewmate needs to walk a single tile.
+    """
+
+    # private
+    _cells: dict[Hashable, dict[int, Hashable]]
+    _edges: dict[tuple[Hashable, Hashable, int], Hashable]
+    _resting: dict[Hashable, tuple[Hashable, int]]
+    _agent_keys: dict[Hashable, list[tuple]]
+
+    def __init__(self) -> None:
+        self._cells = {}
+        self._edges = {}
+        self._resting = {}
+        self._agent_keys = {}
+
+    def is_free(self, node: Hashable, time: int, agent: Hashable) -> bool:
+        """
+        Check if the node can be entered by the agent at the given time.
+        :param node: Hashable - the node to check
+        :param time: int - the step the node would be entered at
+        :param agent: Hashable - the agent asking
+        """
+        owner = self._cells.get(node, {}).get(time)
+        if owner is not None and owner is not agent:
+            return False
+
+        resting = self._resting.get(node)
+        return resting is None or resting[0] is agent or time < resting[1]
+
+    def is_free_after(self, node: Hashable, time: int, agent: Hashable) -> bool:
+        """
+        Check that no other agent has reserved the node after the given time, so the agent can rest on it.
+        :param node: Hashable - the node to check
+        :param time: int - the step the agent would start resting at
+        :param agent: Hashable - the agent asking
+        """
+        for reserved_time, owner in self._cells.get(node, {}).items():
+            if reserved_time > time and owner is not agent:
+                return False
+        return True
+
+    def is_edge_free(self, node_from: Hashable, node_to: Hashable, time: int, agent: Hashable) -> bool:
+        """
+        Check that no other agent walks the same edge in the opposite direction during the step.
+        :param node_from: Hashable - the node the agent leaves
+        :param node_to: Hashable - the node the agent enters
+        :param time: int - the step the move starts at
+        :param agent: Hashable - the agent asking
+        """
+        owner = self._edges.get((node_to, node_from, time))
+        return owner is None or owner is agent
+
+    def reserve_path(self, agent: Hashable, path: list[Hashable], start_time: int, window: int = None) -> None:
+        """
+        Reserve the nodes of a timed path (one node per step) and let the agent rest on the last one.
+        :param agent: Hashable - the agent the path belongs to
+        :param path: list[Hashable] - the timed path, repeated nodes are waits
+        :param start_time: int - the step of the first node
+        :param window: int - reserve only this many steps, the agent has to replan before they run out
+        """
+        keys = self._agent_keys.setdefault(agent, [])
+        reserved = path if window is None else path[:window + 1]
+
+        for step, node in enumerate(reserved):
+            time = start_time + step
+            self._cells.setdefault(node, {})[time] = agent
+            keys.append(("cell", (node, time)))
+
+            if step > 0 and path[step - 1] != node:
+                edge = (path[step - 1], node, time - 1)
+                self._edges[edge] = agent
+                keys.append(("edge", edge))
+
+        if len(path) > 0 and len(reserved) == len(path):
+            self._resting[path[-1]] = (agent, start_time + len(path) - 1)
+            keys.append(("rest", path[-1]))
+
+    def release(self, agent: Hashable) -> None:
+        """
+        Drop every reservation made by the agent.
+        :param agent: Hashable - the agent to release
+        """
+        for kind, key in self._agent_keys.pop(agent, []):
+            match kind:
+                case "cell":
+                    node_cells = self._cells.get(key[0], {})
+                    if node_cells.get(key[1]) is agent:
+                        del node_cells[key[1]]
+                case "edge":
+                    if self._edges.get(key) is agent:
+                        del self._edges[key]
+                case "rest":
+                    if key in self._resting and self._resting[key][0] is agent:
+                        del self._resting[key]
+
+    def purge(self, time: int) -> None:
+        """
+        Forget the reservations of steps that have already passed.
+        :param time: int - the current step
+        """
+        for node in list(self._cells.keys()):
+            node_cells = {cell_time: agent for cell_time, agent in self._cells[node].items() if cell_time >= time}
+            if len(node_cells) > 0:
+                self._cells[node] = node_cells
+            else:
+                del self._cells[node]
+        self._edges = {key: agent for key, agent in self._edges.items() if key[2] >= time}
+        for agent, keys in self._agent_keys.items():
+            self._agent_keys[agent] = [
+                (kind, key) for kind, key in keys
+                if kind == "rest" or (kind == "cell" and key[1] >= time) or (kind == "edge" and key[2] >= time)
+                ]
+
+    def clear(self) -> None:
+        """Drop every reservation."""
+        self._cells.clear()
+        self._edges.clear()
+        self._resting.clear()
+        self._agent_keys.clear()
+
+def cooperative_astar(graph: dict[Hashable, list[Hashable]],
+                      start: Hashable,
+                      end: Hashable,
+                      agent: Hashable,
+                      reservations: ReservationTable,
+                      start_time: int,
+                      heuristic: Callable[[Hashable, Hashable], int],
+                      blocked: Callable[[Hashable], bool] = None,
+                      window: int = None,
+                      routing_table: RoutingTable = None,
+                      max_steps: int = None
+                      ) -> Union[list[Hashable], None]:
+    """
+    Space-time A* that avoids the cells and edges reserved by other agents (WHCA*).
+    Returns a timed path with one node per step (repeated nodes are waits) or None if no path was found.
+    :param graph: dict[Hashable, list[Hashable]] - the navigation graph
+    :param start: Hashable - the start node
+    :param end: Hashable - the end node
+    :param agent: Hashable - the agent the path is planned for
+    :param reservations: ReservationTable - the reservations of the other agents
+    :param start_time: int - the step the agent starts at
+    :param heuristic: Callable - true (or admissible) distance between two nodes, in steps, or None if they aren't connected
+    :param blocked: Callable - returns True for nodes that can't be entered at all (e.g. idle crewmates)
+    :param window: int - only the first window steps respect reservations, the rest is taken from routing_table
+        and the agent is expected to replan before the window runs out
+    :param routing_table: RoutingTable - used to finish the path once the window is exhausted
+    :param max_steps: int - give up after this many steps (defaults to four times the graph size)
+    """
+    if start not in graph or end not in graph:
+        return None
+    distance = heuristic(start, end)
+    if distance is None: # the end can't be reached at all, e.g. behind a closed door
+        return None
+    if max_steps is None:
+        max_steps = len(graph) * 4
+
+    # a goal that can't be entered would only fail once every state up to max_steps was searched
+    if end != start and blocked is not None and blocked(end):
+        return None
+    horizon = window if window is not None else max_steps
+    if distance <= horizon and not any(reservations.is_free(end, start_time + step, agent) for step in range(distance, horizon + 1)):
+        return None
+
+    tie_breaker = count()
+    open_heap = [(distance, next(tie_breaker), 0, start)]
+    came_from = {(start, 0): None}
+    closed_set = set()
+
+    while open_heap:
+        _, _, step, node = heappop(open_heap)
+        state = (node, step)
+        if state in closed_set:
+            continue
+        closed_set.add(state)
+
+        window_exhausted = window is not None and routing_table is not None and step >= window
+        # the goal is only final if nobody needs to pass through it later
+        if (node == end and reservations.is_free_after(end, start_time + step, agent)) or window_exhausted:
+            path = []
+            while state is not None:
+                path.append(state[0])
+                state = came_from[state]
+            path.reverse()
+
+            if window_exhausted and node != end:
+                tail = routing_table.get_route(node, end)
+                if tail is None:
+                    return None
+                path.extend(tail[1:])
+            return path
+
+        if step >= max_steps:
+            continue
+
+        time = start_time + step + 1
+        for neighbour in (node, *graph[node]): # waiting is a valid move
+            next_state = (neighbour, step + 1)
+            if next_state in closed_set:
+                continue
+            if neighbour != node and blocked is not None and blocked(neighbour):
+                continue
+            if not reservations.is_free(neighbour, time, agent) or not reservations.is_edge_free(node, neighbour, time - 1, agent):
+                continue
+            if next_state in came_from:
+                continue
+            distance = heuristic(neighbour, end)
+            if distance is None: # the end can't be reached from the neighbour
+                continue
+
+            came_from[next_state] = state
+            heappush(open_heap, (step + 1 + distance, next(tie_breaker), step + 1, neighbour))
+
+    return None
@@ -0,0 +1,156 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Union
+from array import array
+from collections import deque
+
+if TYPE_CHECKING:
+    from modules.spaceship.tile import Tile
+
+class RoutingTable:
+    """
+    Next-hop routing table over a ship's navigation graph.
+    Every row is built lazily with a BFS from a destination tile and stores, for every tile of the ship,
+    the index of the neighbouring tile that is one step closer to that destination.
+    """
+
+    # public
+    tiles: list[Tile]
+
+    # private
+    _graph: dict[Tile, list[Tile]]
+    _index: dict[Tile, int]
+    _next_hop: dict[int, array]
+    _distance: dict[int, array]
+
+    def __init__(self, graph: dict[Tile, list[Tile]]) -> None:
+        """
+        :param graph: dict[Tile, list[Tile]] - the navigation graph the table routes over
+        """
+        self._graph = graph
+        self.tiles = list(graph.keys())
+        self._index = {tile: index for index, tile in enumerate(self.tiles)}
+        self._next_hop = {}
+        self._distance = {}
+
+    def get_route(self, start: Tile, end: Tile) -> Union[list[Tile], None]:
+        """
+        Walk the table from the start tile to the end tile.
+        :param start: Tile - the start tile
+        :param end: Tile - the destination tile
+        :return: Union[list[Tile], None] - the route including both ends or None if the end is unreachable
+        """
+        if start not in self._index or end not in self._index:
+            return None
+
+        target = self._index[end]
+        if target not in self._next_hop:
+            self._build_row(target)
+        next_hop = self._next_hop[target]
+
+        current = self._index[start]
+        if next_hop[current] == -1:
+            return None
+
+        route = [start]
+        while current != target:
+            current = next_hop[current]
+            route.append(self.tiles[current])
+
+        return route
+
+    def distance(self, start: Tile, end: Tile) -> Union[int, None]:
+        """
+        Return the number of steps between two tiles or None if the end is unreachable.
+        :param start: Tile - the start tile
+        :param end: Tile - the destination tile
+        """
+        if start not in self._index or end not in self._index:
+            return None
+
+        target = self._index[end]
+        if target not in self._distance:
+            self._build_row(target)
+
+        distance = self._distance[target][self._index[start]]
+        return distance if distance != -1 else None
+
+    def edge_changed(self, tile1: Tile, tile2: Tile, passable: bool) -> None:
+        """
+        Drop only the rows whose shortest path tree is affected by an edge being added or removed.
+        The graph itself has to be updated by the caller.
+        :param tile1: Tile - first end of the edge
+        :param tile2: Tile - second end of the edge
+        :param passable: bool - True if the edge was added, False if it was removed
+        """
+        a = self._index[tile1]
+        b = self._index[tile2]
+
+        for target in list(self._next_hop.keys()):
+            next_hop = self._next_hop[target]
+            distance = self._distance[target]
+
+            if passable:
+                # a new edge only matters if it creates a shorter path to either end
+                if distance[a] == -1 and distance[b] == -1:
+                    continue
+                if distance[a] != -1 and distance[b] != -1 and abs(distance[a] - distance[b]) <= 1:
+                    continue
+            elif next_hop[a] != b and next_hop[b] != a: # the removed edge was not part of any route
+                continue
+
+            del self._next_hop[target]
+            del self._distance[target]
+
+    def clear(self) -> None:
+        """Drop every built row."""
+        self._next_hop.clear()
+        self._distance.clear()
+
+    def _build_row(self, target: int) -> None:
+        """
+        Run a BFS from the target tile and store the next hop of every tile towards it.
+        :param target: int - the index of the destination tile
+        """
+        size = len(self.tiles)
+        next_hop = array("i", [-1]) * size
+        distance = array("i", [-1]) * size
+
+        next_hop[target] = target
+        distance[target] = 0
+
+        queue = deque((target,))
+        while queue:
+            current = queue.popleft()
+            for neighbour in self._graph[self.tiles[current]]:
+                index = self._index[neighbour]
+                if distance[index] != -1:
+                    continue
+
+                distance[index] = distance[current] + 1
+                next_hop[index] = current
+                queue.append(index)
+
+        self._next_hop[target] = next_hop
+        self._distance[target] = distance
+
+def build_flow_field(graph: dict[Tile, list[Tile]], targets: list[Tile]) -> dict[Tile, Union[Tile, None]]:
+    """
+    Build a flow field towards a group of target tiles (e.g. every tile of a room).
+    Every edge of the navigation graph has the same cost, so the Dijkstra pass is a multi-source BFS.
+    :param graph: dict[Tile, list[Tile]] - the navigation graph
+    :param targets: list[Tile] - the tiles the field flows towards
+    :return: dict[Tile, Union[Tile, None]] - the next tile to step on for every reachable tile, None for the targets
+    """
+    field = {tile: None for tile in targets if tile in graph}
+
+    queue = deque(field.keys())
+    while queue:
+        current = queue.popleft()
+        for neighbour in graph[current]:
+            if neighbour in field:
+                continue
+
+            field[neighbour] = current
+            queue.append(neighbour)
+
+    return field
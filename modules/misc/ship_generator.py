@@ -0,0 +1,151 @@
+from random import Random
+
+# systems without a room implementation
+_UNIMPLEMENTED_SYSTEMS = ("drones", "doors")
+
+_SIDES = ("top", "right", "bottom", "left")
+
+def generate_room_rects(room_count: int, seed: int = None, max_room_size: tuple[int, int] = (4, 3)) -> list[tuple[int, int, int, int]]:
+    """
+    Generate the rooms of a ship without systems or upgrade slots, the same rooms generate_ship_layout places for the seed.
+    Doesn't need the game's resources, so it can be used without the textures.
+    :param room_count: int - the number of rooms
+    :param seed: int - the random seed
+    :param max_room_size: tuple[int, int] - the maximum width and height of a room, in tiles
+    :return: list[tuple[int, int, int, int]] - (x, y, width, height) of every room, in tiles
+    """
+    return _place_rooms(room_count, Random(seed), max_room_size)
+
+def generate_ship_layout(room_count: int,
+                         seed: int = None,
+                         weapon_count: int = 4,
+                         empty_slot_count: int = 2,
+                         max_room_size: tuple[int, int] = (4, 3),
+                         ) -> dict:
+    """
+    Generate a ship layout in the ship_layouts schema: connected, non overlapping rooms of random sizes,
+    one room for every required system and upgrade slots on the outer walls.
+    :param room_count: int - the number of rooms, at least the number of required systems
+    :param seed: int - the random seed, the same seed always generates the same layout
+    :param weapon_count: int - the number of weapons to mount (if there are enough free walls)
+    :param empty_slot_count: int - the number of empty upgrade slots to add
+    :param max_room_size: tuple[int, int] - the maximum width and height of a room, in tiles
+    :return: dict - the layout, ready to be used as a ship_layouts entry
+    """
+    # resources loads the textures when it's imported, only the full layout needs it
+    from modules.resources import systems, weapons, textures
+
+    required_systems = [system for system in systems if system not in _UNIMPLEMENTED_SYSTEMS]
+    room_count = max(room_count, len(required_systems))
+    rng = Random(seed)
+
+    rooms = _place_rooms(room_count, rng, max_room_size)
+    occupied = set().union(*(_room_cells(room) for room in rooms))
+
+    layout = [{"pos": (x, y), "tiles": [[1] * h for _ in range(w)]} for x, y, w, h in rooms]
+
+    for index, system in zip(rng.sample(range(len(rooms)), len(required_systems)), required_systems):
+        layout[index]["role"] = system
+        layout[index]["level"] = rng.randint(2, 4) if system == "weapons" else rng.randint(1, 2)
+
+    # upgrade slots go on walls with nothing behind them, weapons face up or down and thrusters backwards
+    free_walls = {side: [] for side in _SIDES}
+    for index, room in enumerate(rooms):
+        for side in _SIDES:
+            if occupied.isdisjoint(_wall_cells(room, side)):
+                free_walls[side].append(index)
+    used_walls = set()
+
+    def mount(side: str, slot_type: str, name: str) -> bool:
+        candidates = [index for index in free_walls[side] if (index, side) not in used_walls]
+        if len(candidates) == 0:
+            return False
+
+        index = rng.choice(candidates)
+        used_walls.add((index, side))
+        layout[index].setdefault("upgrade_slots", {}).setdefault(slot_type, {})[side] = name
+        return True
+
+    weapon_names = sorted(weapons.keys())
+    for _ in range(weapon_count):
+        mount(rng.choice(("top", "bottom")), "weapon", rng.choice(weapon_names))
+    mount("left", "thruster", sorted(textures["thrusters"].keys())[0])
+    mount("right", "shield", sorted(textures["shield_upgrades"].keys())[0])
+    for _ in range(empty_slot_count):
+        mount(rng.choice(("top", "bottom")), "weapon", None)
+
+    return {"rooms": layout}
+
+def register_generated_layout(room_count: int, seed: int = None, **kwargs) -> str:
+    """
+    Generate a ship layout and add it to ship_layouts, so it can be used as a ship_type.
+    :param room_count: int - the number of rooms
+    :param seed: int - the random seed
+    :return: str - the name of the registered layout
+    """
+    from modules.resources import ship_layouts
+
+    name = f"generated_{room_count}_{seed}"
+    if name not in ship_layouts:
+        ship_layouts[name] = generate_ship_layout(room_count, seed, **kwargs)
+    return name
+
+def _place_rooms(room_count: int, rng: Random, max_room_size: tuple[int, int]) -> list[tuple[int, int, int, int]]:
+    """Grow connected, non overlapping rooms from a first room and move the ship to the origin."""
+    rooms = [(0, 0, rng.randint(2, max(2, max_room_size[0])), rng.randint(1, max_room_size[1]))]
+    occupied = _room_cells(rooms[0])
+
+    attempts = 0
+    while len(rooms) < room_count:
+        attempts += 1
+        if attempts > room_count * 200:
+            raise RuntimeError("Could not generate ship layout: Ran out of space to place rooms!")
+
+        room = _grow_room(rng.choice(rooms), rng.choice(_SIDES), rng, max_room_size)
+        cells = _room_cells(room)
+        if not occupied.isdisjoint(cells):
+            continue
+
+        rooms.append(room)
+        occupied |= cells
+
+    # move the ship to the origin
+    min_x = min(room[0] for room in rooms)
+    min_y = min(room[1] for room in rooms)
+    return [(x - min_x, y - min_y, w, h) for x, y, w, h in rooms]
+
+def _grow_room(room: tuple[int, int, int, int], side: str, rng: Random, max_room_size: tuple[int, int]) -> tuple[int, int, int, int]:
+    """Return a random room touching the given side of a room, sharing at least one tile of wall with it."""
+    x, y, w, h = room
+    new_w = rng.randint(1, max_room_size[0])
+    new_h = rng.randint(1, max_room_size[1])
+    if new_w * new_h == 1: # single tile rooms only make sense as corridors
+        new_w += 1 if side in ("top", "bottom") else 0
+        new_h += 1 if side in ("left", "right") else 0
+
+    match side:
+        case "top":
+            return (rng.randint(x - new_w + 1, x + w - 1), y - new_h, new_w, new_h)
+        case "bottom":
+            return (rng.randint(x - new_w + 1, x + w - 1), y + h, new_w, new_h)
+        case "left":
+            return (x - new_w, rng.randint(y - new_h + 1, y + h - 1), new_w, new_h)
+        case _:
+            return (x + w, rng.randint(y - new_h + 1, y + h - 1), new_w, new_h)
+
+def _room_cells(room: tuple[int, int, int, int]) -> set[tuple[int, int]]:
+    x, y, w, h = room
+    return {(x + dx, y + dy) for dx in range(w) for dy in range(h)}
+
+def _wall_cells(room: tuple[int, int, int, int], side: str) -> set[tuple[int, int]]:
+    """Return the cells just outside a wall of a room."""
+    x, y, w, h = room
+    match side:
+        case "top":
+            return {(x + dx, y - 1) for dx in range(w)}
+        case "bottom":
+            return {(x + dx, y + h) for dx in range(w)}
+        case "left":
+            return {(x - 1, y + dy) for dy in range(h)}
+        case _:
+            return {(x + w, y + dy) for dy in range(h)}
@@ -0,0 +1,109 @@
+from __future__ import annotations
+from typing import Hashable
+import pygame as pg
+
+class SpatialHash:
+    """
+    Uniform grid index over rects, point and rect queries only look at the cells they touch.
+    Items are indexed by the rect they were inserted with, so moved items have to be updated with move().
+    """
+
+    # public
+    cell_size: int
+
+    # private
+    _cells: dict[tuple[int, int], dict[Hashable, None]]
+    _items: dict[Hashable, tuple[pg.Rect, tuple[tuple[int, int], ...]]]
+
+    def __init__(self, cell_size: int = 32) -> None:
+        """
+        :param cell_size: int - the size of a cell in pixels
+        """
+        self.cell_size = cell_size
+        self._cells = {}
+        self._items = {}
+
+    def insert(self, item: Hashable, rect: pg.Rect) -> None:
+        """
+        Add an item to the index, an item that is already indexed is moved.
+        :param item: Hashable - the item
+        :param rect: pg.Rect - the area the item covers
+        """
+        if item in self._items:
+            self.move(item, rect)
+            return
+
+        cells = self._cells_of(rect)
+        for cell in cells:
+            self._cells.setdefault(cell, {})[item] = None
+        self._items[item] = (pg.Rect(rect), cells)
+
+    def remove(self, item: Hashable) -> None:
+        """
+        Remove an item from the index.
+        :param item: Hashable - the item
+        """
+        entry = self._items.pop(item, None)
+        if entry is None:
+            return
+
+        for cell in entry[1]:
+            bucket = self._cells[cell]
+            del bucket[item]
+            if len(bucket) == 0:
+                del self._cells[cell]
+
+    def move(self, item: Hashable, rect: pg.Rect) -> None:
+        """
+        Update the area of an indexed item, the buckets are only touched if the covered cells changed.
+        :param item: Hashable - the item
+        :param rect: pg.Rect - the new area the item covers
+        """
+        entry = self._items.get(item)
+        if entry is None:
+            self.insert(item, rect)
+            return
+
+        cells = self._cells_of(rect)
+        if cells != entry[1]:
+            self.remove(item)
+            self.insert(item, rect)
+        else:
+            entry[0].update(rect)
+
+    def query_point(self, pos: tuple[int, int]) -> list[Hashable]:
+        """
+        Return the items whose rect contains the point.
+        :param pos: tuple[int, int] - the point
+        """
+        cell = (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+        return [item for item in self._cells.get(cell, ()) if self._items[item][0].collidepoint(pos)]
+
+    def query_rect(self, rect: pg.Rect) -> list[Hashable]:
+        """
+        Return the items whose rect overlaps the rect.
+        :param rect: pg.Rect - the area to search
+        """
+        found = {}
+        for cell in self._cells_of(rect):
+            for item in self._cells.get(cell, ()):
+                if item not in found and self._items[item][0].colliderect(rect):
+                    found[item] = None
+        return list(found)
+
+    def clear(self) -> None:
+        """Remove every item."""
+        self._cells.clear()
+        self._items.clear()
+
+    def _cells_of(self, rect: pg.Rect) -> tuple[tuple[int, int], ...]:
+        """Return the cells a rect covers (a rect's right and bottom edges are exclusive)."""
+        left = rect.left // self.cell_size
+        top = rect.top // self.cell_size
+        right = (rect.right - 1) // self.cell_size if rect.width > 0 else left
+        bottom = (rect.bottom - 1) // self.cell_size if rect.height > 0 else top
+
+        return tuple((x, y) for x in range(left, right + 1) for y in range(top, bottom + 1))
+
+    def __len__(self) -> int:
+        return len(self._items)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+from collections import OrderedDict
+import pygame as pg
+
+class TextCache:
+    """
+    Rendered text shared by everything that draws labels, keyed by font, text, colour and antialiasing.
+    The least recently used texts are dropped once the cache is full. The returned surfaces are shared and must not be drawn on.
+    """
+
+    # public
+    max_size: int
+    hits: int
+    misses: int
+
+    # private
+    _texts: OrderedDict[tuple, pg.Surface]
+    _glyphs: dict[tuple, dict[str, pg.Surface]] # single characters used to put numbers together, per font and colour
+
+    def __init__(self, max_size: int = 256) -> None:
+        """
+        :param max_size: int - how many rendered texts are kept
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._texts = OrderedDict()
+        self._glyphs = {}
+
+    def render(self, font: pg.font.Font, text: str, antialias: bool, color: tuple[int, int, int]) -> pg.Surface:
+        """
+        Return the text rendered with the font, only rendered the first time it's requested.
+        :param font: pg.font.Font - the font
+        :param text: str - the text
+        :param antialias: bool - if the text is antialiased
+        :param color: tuple[int, int, int] - the colour of the text
+        """
+        key = (font, text, antialias, tuple(color))
+        surface = self._get(key)
+        if surface is None:
+            surface = self._put(key, font.render(text, antialias, color))
+        return surface
+
+    def render_number(self, font: pg.font.Font, value: int, antialias: bool, color: tuple[int, int, int], suffix: str = "") -> pg.Surface:
+        """
+        Return a number rendered with the font, meant for counters that change often.
+        Numbers that aren't cached yet are put together from digits that are rendered once per font and colour,
+        without kerning, so the spacing can differ by a pixel from render().
+        :param font: pg.font.Font - the font
+        :param value: int - the number
+        :param antialias: bool - if the number is antialiased
+        :param color: tuple[int, int, int] - the colour of the number
+        :param suffix: str - text put after the number, e.g. " %"
+        """
+        text = f"{value}{suffix}"
+        key = (font, text, antialias, tuple(color))
+        surface = self._get(key)
+        if surface is not None:
+            return surface
+
+        glyphs = self._glyphs.get((font, antialias, key[3]))
+        if glyphs is None:
+            glyphs = self._glyphs[(font, antialias, key[3])] = {}
+
+        blits = []
+        width = height = 0
+        for char in text:
+            glyph = glyphs.get(char)
+            if glyph is None:
+                glyph = glyphs[char] = self._render_glyph(font, char, antialias, color)
+            # the surface is transparent, so the max copies the glyph without blending it with the background
+            blits.append((glyph, (width, 0), None, pg.BLEND_RGBA_MAX))
+            width += glyph.get_width()
+            height = max(height, glyph.get_height())
+
+        surface = pg.Surface((width, height), pg.SRCALPHA)
+        surface.blits(blits, False)
+        return self._put(key, surface)
+
+    def clear(self) -> None:
+        """Drop every rendered text and glyph."""
+        self._texts.clear()
+        self._glyphs.clear()
+
+    @staticmethod
+    def _render_glyph(font: pg.font.Font, char: str, antialias: bool, color: tuple[int, int, int]) -> pg.Surface:
+        glyph = font.render(char, antialias, color)
+        if not antialias: # rendered with a colour key, the max needs the transparency in the alpha channel
+            glyph = glyph.convert_alpha()
+        return glyph
+
+    def _get(self, key: tuple) -> pg.Surface:
+        surface = self._texts.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._texts.move_to_end(key)
+        return surface
+
+    def _put(self, key: tuple, surface: pg.Surface) -> pg.Surface:
+        self._texts[key] = surface
+        if len(self._texts) > self.max_size:
+            self._texts.popitem(last=False)
+        return surface
+
+# shared by the whole interface
+text_cache = TextCache()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+from weakref import WeakKeyDictionary
+import pygame as pg
+
+class TransformCache:
+    """
+    Rotated and flipped variants of surfaces, keyed by the source surface and the operation.
+    Every variant is computed once and shared, so it must not be drawn on. The variants of a surface
+    are dropped together with it.
+    """
+
+    # public
+    hits: int
+    misses: int
+
+    # private
+    _variants: WeakKeyDictionary[pg.Surface, dict[tuple, pg.Surface]]
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self._variants = WeakKeyDictionary()
+
+    def rotate(self, surface: pg.Surface, angle: int) -> pg.Surface:
+        """
+        Return the surface rotated counterclockwise, like pg.transform.rotate.
+        :param surface: pg.Surface - the source surface
+        :param angle: int - the angle in degrees
+        """
+        variant = self._get(surface, ("rotate", angle))
+        if variant is None:
+            variant = self._put(surface, ("rotate", angle), pg.transform.rotate(surface, angle))
+        return variant
+
+    def flip(self, surface: pg.Surface, flip_x: bool, flip_y: bool) -> pg.Surface:
+        """
+        Return the surface mirrored, like pg.transform.flip.
+        :param surface: pg.Surface - the source surface
+        :param flip_x: bool - mirror it horizontally
+        :param flip_y: bool - mirror it vertically
+        """
+        variant = self._get(surface, ("flip", flip_x, flip_y))
+        if variant is None:
+            variant = self._put(surface, ("flip", flip_x, flip_y), pg.transform.flip(surface, flip_x, flip_y))
+        return variant
+
+    def clear(self) -> None:
+        """Drop every variant and reset the counters."""
+        self._variants.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        """The number of cached variants."""
+        return sum(len(variants) for variants in self._variants.values())
+
+    def _get(self, surface: pg.Surface, operation: tuple) -> pg.Surface:
+        variants = self._variants.get(surface)
+        variant = variants.get(operation) if variants is not None else None
+        if variant is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return variant
+
+    def _put(self, surface: pg.Surface, operation: tuple, variant: pg.Surface) -> pg.Surface:
+        variants = self._variants.get(surface)
+        if variants is None:
+            variants = self._variants[surface] = {}
+        variants[operation] = variant
+        return variant
+
+# shared by everything that turns textures
+transform_cache = TransformCache()
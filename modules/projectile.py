@@ -5,8 +5,11 @@ from random import randint
 
 if TYPE_CHECKING:
     from modules.spaceship.room import Room
+    from modules.spaceship.spaceship import Spaceship
+    from modules.spaceship.ship_transform import ShipTransform
 
 from modules.resources import get_font
+from modules.misc.transform_cache import transform_cache
 
 class Projectile():
     # public
@@ -60,9 +63,10 @@ class Projectile():
         self.switched_screens = False
         
         self.target_pos = first_pos
+        target_rect = self._target_room.parent.transform.to_draw_rect(self._target_room.rect)
         self.future_pos = (
-            self._target_room.rect.centerx + randint(-self._target_room.rect.width // 2, self._target_room.rect.width // 2),
-            self._target_room.rect.centery + randint(-self._target_room.rect.height // 2, self._target_room.rect.height // 2)
+            target_rect.centerx + randint(-target_rect.width // 2, target_rect.width // 2),
+            target_rect.centery + randint(-target_rect.height // 2, target_rect.height // 2)
         )
         self._vector2d_start = pg.math.Vector2(start_pos)
         self._vector2d_end = self._vector2d_start.move_towards(self.target_pos, length)
@@ -112,19 +116,32 @@ class Projectile():
             else:
                 self._missed_pos = (self._missed_pos[0], self._missed_pos[1] - 0.5)
 
-    def draw(self, screen: pg.surface.Surface) -> None:
+    def draw(self, screen: pg.surface.Surface, view: ShipTransform = None) -> list[pg.Rect]:
         """
         Draw the projectile on the screen.
         :param screen: pg.surface.Surface - the screen to draw the projectile on
+        :param view: ShipTransform - the transform of the ship the screen belongs to, the projectile is mapped into its view
+        :return: list[pg.Rect] - the areas of the screen that were drawn on
         """
+        rotated = view is not None and view.rotated
+        drawn = []
+
         if self.delay <= 0:
-            pg.draw.line(screen, self.color, self._vector2d_start, self._vector2d_end, self.width)
+            if rotated:
+                drawn.append(pg.draw.line(screen, self.color, view.rotate_point(self._vector2d_start), view.rotate_point(self._vector2d_end), self.width))
+            else:
+                drawn.append(pg.draw.line(screen, self.color, self._vector2d_start, self._vector2d_end, self.width))
         
         if self.missed:
-            if not self.enemy_projectile:
-                screen.blit(pg.transform.rotate(self._missed_label, 270), self._missed_pos)
+            if rotated: # the view is already turned, the label stays upright
+                label_rect = view.rotate_rect(pg.Rect(self._missed_pos, self._missed_label.get_size()[::-1]))
+                drawn.append(screen.blit(self._missed_label, label_rect))
+            elif not self.enemy_projectile:
+                drawn.append(screen.blit(transform_cache.rotate(self._missed_label, 270), self._missed_pos))
             else:
-                screen.blit(self._missed_label, self._missed_pos)
+                drawn.append(screen.blit(self._missed_label, self._missed_pos))
+
+        return drawn
 
     def update_vectors(self, new_pos: tuple[int, int]) -> None:
         """
@@ -144,6 +161,11 @@ class Projectile():
 
         return self._vector2d_start.x, self._vector2d_start.y, self.length
     
+    @property
+    def target_ship(self) -> Spaceship:
+        """The ship the projectile was fired at."""
+        return self._target_room.parent
+
     def __del__(self) -> None:
         """Delete the projectile."""
         del self
\ No newline at end of file
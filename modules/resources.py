@@ -17,22 +17,41 @@ _FILEPATH = path.join(_CONTENT, "img")
 GLOBAL_DEBUG_OPTIONS = {
     "show_hitboxes": False,
     "show_pathfinding": False,
+    "verify_ship_registry": False, # check the cached power and upgrade totals against a full recount
 }
 
 pg.font.init()
 
+# every font is only loaded once, the font objects are shared and must not be changed (e.g. with set_bold)
+_fonts: dict[tuple[str, int, bool], pg.font.Font] = {}
+# fonts that are not in the local dir, they go straight to the system font
+_missing_fonts: set[str] = set()
+
 def get_font(font: str ="arial", size=16, bold=False) -> pg.font.Font:
     """Return a pygame.font.Font object with the specified font, size and boldness."""
     # if font == "arial":
     #     return pg.font.Font(path.join(_FONTS, "arial.ttf"), size)
-    try: 
-        res_font = pg.font.Font(path.join(_FONTS, f"{font}.ttf"), size)
-    except:
-        print(f"Font {font} was not found in the local dir! Using default system font...")
+    res_font = _fonts.get((font, size, bold))
+    if res_font is not None:
+        return res_font
+
+    if font not in _missing_fonts:
+        try: 
+            res_font = pg.font.Font(path.join(_FONTS, f"{font}.ttf"), size)
+        except:
+            print(f"Font {font} was not found in the local dir! Using default system font...")
+            _missing_fonts.add(font)
+    if res_font is None:
         res_font = pg.font.SysFont("arial", size, bold=bold)
 
+    _fonts[(font, size, bold)] = res_font
     return res_font
 
+def load_fonts() -> None:
+    """Load the fonts used by the interface ahead of time, so building it doesn't have to."""
+    for font in font_config:
+        get_font(*font)
+
 def load_config() -> dict:
     with open("config.json", "r", encoding="utf-8-sig") as file:
         return json.load(file)
@@ -638,6 +657,15 @@ button_palletes = {
     }
 }
 
+# the fonts loaded at startup, as (name, size, bold)
+font_config = [
+    ("arial", 16, False),
+    ("arial", 18, False),
+    ("arial", 20, False),
+    ("num_font", 16, False),
+    ("num_font", 24, False),
+]
+
 crewmate_names = json.loads(open(path.join(_CONTENT, "crewmate_names.json"), "r").read())
 
 autocomplete_configs(button_palletes, "button_palletes")
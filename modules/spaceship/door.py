@@ -1,15 +1,22 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Union
 import pygame as pg
 
+if TYPE_CHECKING:
+    from modules.spaceship.tile import Tile
+
 from modules.resources import textures
+from modules.misc.transform_cache import transform_cache
 
 class Door(pg.sprite.Sprite):
     # public
-    rect: pg.Rect
-    hitbox: pg.Rect
+    rect: pg.Rect # in ship space
 
     image: pg.Surface
+    tiles: Union[tuple[Tile, Tile], None]
 
     opened: bool
+    passable: bool
     opened_cooldown: int = 60 # time the door stays open
     opened_timer: int = 0 # time the door has been open
 
@@ -21,22 +28,28 @@ class Door(pg.sprite.Sprite):
     def __init__(self, 
                  pos: tuple, 
                  sprite_group: pg.sprite.Group,
-                 vertical: bool = False
+                 vertical: bool = False,
+                 tiles: tuple[Tile, Tile] = None
                  ) -> None:
         pg.sprite.Sprite.__init__(self, sprite_group)
 
         self._txt_set = textures["door"]
-        self._txt_closed = pg.transform.rotate(self._txt_set["closed"],90) if vertical else self._txt_set["closed"]
-        self._txt_open = pg.transform.rotate(self._txt_set["open"],90) if vertical else self._txt_set["open"]
+        self._txt_closed = transform_cache.rotate(self._txt_set["closed"],90) if vertical else self._txt_set["closed"]
+        self._txt_open = transform_cache.rotate(self._txt_set["open"],90) if vertical else self._txt_set["open"]
         self.image = self._txt_closed
         self.rect = self.image.get_rect()
 
         self.rect.centerx = pos[0]
         self.rect.centery = pos[1]
 
-        self.hitbox = self.rect.copy()
-
         self.opened = False
+        self.passable = True
+        self.tiles = tiles
+
+    @property
+    def hitbox(self) -> pg.Rect:
+        """The door's rect on screen."""
+        return self.tiles[0].parent_room.parent.transform.hitbox_of(self)
 
     def toggle(self) -> None:
         """
@@ -7,13 +7,29 @@ if TYPE_CHECKING:
     from modules.spaceship.spaceship import Spaceship
 
 from modules.spaceship.tile import Tile
+from modules.misc.pathfinding import astar_pathfinding
 from modules.spaceship.upgrades import *
 from modules.resources import textures, GameEvents
+from modules.misc.transform_cache import transform_cache
+
+# translucent overlays shared by all rooms, keyed by size and alpha
+_overlays: dict[tuple[tuple[int, int], int], pg.Surface] = {}
+
+def get_overlay(size: tuple[int, int], alpha: int) -> pg.Surface:
+    """
+    Return a black overlay surface of the given size and alpha, the surface is shared and must not be drawn on.
+    :param size: tuple[int, int] - the size of the overlay
+    :param alpha: int - the alpha of the overlay
+    """
+    overlay = _overlays.get((size, alpha))
+    if overlay is None:
+        overlay = _overlays[(size, alpha)] = pg.Surface(size, pg.SRCALPHA)
+        overlay.fill((0,0,0,alpha))
+    return overlay
 
 class Room(pg.sprite.Group):
     # public
-    rect: pg.Rect
-    hitbox: pg.Rect
+    rect: pg.Rect # in ship space
 
     pos: tuple[int, int]
     room_layout: list[list[int]]
@@ -38,10 +54,15 @@ class Room(pg.sprite.Group):
     _enemy_ship: bool
     _power: int 
     _health: int
+    _inner_paths: dict[tuple[tuple[int, int], tuple[int, int]], Union[list[Tile], None]]
+    _selected: bool
+    _hovering: bool
+    _aimed_at: bool
+    _bitmap: Union[pg.Surface, None] # the tiles, markers, border, icon and overlays, composited in view space
+    _bitmap_targeted: bool # if the bitmap shows the targeted outline
 
     def __init__(self, 
                  pos: tuple[int, int],
-                 realpos: tuple[int, int],
                  room_layout: list[list[int]],
                  parent: Spaceship,
                  upgrade_slots: dict[str, str] = {},
@@ -51,29 +72,28 @@ class Room(pg.sprite.Group):
                  ) -> None:
         
         pg.sprite.Group.__init__(self)
+        self._bitmap = None
+        self._bitmap_targeted = False
         self.rect = pg.Rect(
             (pos[0], pos[1]), 
             (len(room_layout)*32, len(room_layout[0])*32))
-        if enemy_ship:
-            self.hitbox = pg.Rect(realpos, (self.rect.width, self.rect.height)[::-1])
-        else:
-            self.hitbox = pg.Rect(realpos, (self.rect.width, self.rect.height))
     
         self.pos = pos
         self.room_layout = room_layout
         self.room_tile_layout = list()
         self.adjecent_rooms = {}
+        self._inner_paths = {}
         self.upgrade_slots = {}
         self.parent = parent
         self._upgrade_index = 0
         self._enemy_ship = enemy_ship
 
         # player interaction
-        self.selected = False
-        self.hovering = False
+        self._selected = False
+        self._hovering = False
 
         # enemy ship
-        self.aimed_at = False
+        self._aimed_at = False
         self.targeted_by = []
 
         self.repair_progress = 0
@@ -106,7 +126,7 @@ class Room(pg.sprite.Group):
         :param mouse_clicked: tuple[bool, bool, bool] - the current state of the mouse buttons
         """
 
-        if self.rect.collidepoint(mouse_pos):
+        if self.hitbox.collidepoint(mouse_pos):
             if mouse_clicked[0]:
                 self.selected = True
                 self.hovering = False
@@ -124,45 +144,85 @@ class Room(pg.sprite.Group):
     def draw(self, screen: pg.surface.Surface) -> None:
         """
         Draw the room and it's components on the screen.
-        :param screen: pg.surface.Surface - the screen to draw on
+        :param screen: pg.surface.Surface - the ship's view surface
         """
 
-        sprites = self.sprites()
+        view = self.parent.transform
+
+        self.refresh()
+        screen.blit(self._bitmap, view.to_view_rect(self.rect))
+
+        # upgrade slots stick out of the room and are animated, they are drawn every frame
+        for spr in self.upgrade_slots.values():
+            self.spritedict[spr] = screen.blit(view.view_image(spr.image), view.to_view_rect(spr.rect))
+
+    def refresh(self) -> bool:
+        """
+        Redraw the room's bitmap if it's out of date.
+        :return: bool - True if the bitmap was redrawn
+        """
+
+        # the targeted outline depends on the sensors of the player's ship, so it's checked every frame
+        targeted = ((not self._enemy_ship and self.parent.installed_systems["sensors"].power >= 2) or self._enemy_ship) and len(self.targeted_by) > 0
+        if self._bitmap is None or targeted != self._bitmap_targeted:
+            self._bitmap_targeted = targeted
+            self._render_bitmap()
+            return True
+        return False
 
-        # draw all sprites in the room
-        for spr in sprites:
-            self.spritedict[spr] = screen.blit(spr.image, spr.rect)
+    def invalidate(self) -> None:
+        """Redraw the room's bitmap the next time the room is drawn."""
+        self._bitmap = None
 
-        pg.draw.rect(screen, (89,86,82), self.rect, 2)
+    def _render_bitmap(self) -> None:
+        """Composite the static content of the room in view space."""
+
+        view = self.parent.transform
+        rect = view.to_view_rect(self.rect)
+        origin = (-rect.x, -rect.y)
+        rect = rect.move(origin)
+        screen = self._bitmap = pg.Surface(rect.size)
+
+        for tile in self.sprites():
+            if isinstance(tile, Tile):
+                screen.blit(view.view_image(tile.image), view.to_view_rect(tile.rect).move(origin))
+
+        # tiles share one texture, the destination markers are an overlay
+        marker = textures["crewmates"]["destination"].image
+        for tile in self.parent.selected_tiles:
+            if tile.parent_room is self:
+                screen.blit(view.view_image(marker), view.to_view_rect(pg.Rect(tile.rect.topleft, marker.get_size())).move(origin))
+
+        pg.draw.rect(screen, (89,86,82), rect, 2)
 
         # draw icon if the room has a role
         if self.icon is not None:
-            screen.blit(self.icon.image, 
-                        (self.rect.centerx-(self.icon.image.get_width()/2), 
-                         self.rect.centery-(self.icon.image.get_height()/2))
-                        )
+            # centered in ship space, like the room was drawn before it was rotated
+            icon = self.icon.image
+            icon_rect = pg.Rect(
+                (self.rect.centerx-(icon.get_width()/2), 
+                 self.rect.centery-(icon.get_height()/2)),
+                icon.get_size()
+                )
+            screen.blit(view.view_image(icon), view.to_view_rect(icon_rect).move(origin))
         
         # darken the room if selected or hovering
         if self.selected: 
-            s = pg.Surface((self.rect.width, self.rect.height), pg.SRCALPHA) 
-            s.fill((0,0,0,128))
-            screen.blit(s, self.rect)
+            screen.blit(get_overlay(rect.size, 128), rect)
 
         elif self.hovering:
-            s = pg.Surface((self.rect.width, self.rect.height), pg.SRCALPHA) 
-            s.fill((0,0,0,64)) 
-            screen.blit(s, self.rect)
+            screen.blit(get_overlay(rect.size, 64), rect)
         
         # draw a red border if the room is being targeted
         if self.aimed_at:
-            pg.draw.rect(screen, (255,0,0,255), self.rect.inflate(-4, -4), 1)
-            pg.draw.rect(screen, (255,0,0,150), self.rect.inflate(-8, -8), 1)
-            pg.draw.rect(screen, (255,0,0,75), self.rect.inflate(-10, -10), 1)
+            pg.draw.rect(screen, (255,0,0,255), rect.inflate(-4, -4), 1)
+            pg.draw.rect(screen, (255,0,0,150), rect.inflate(-8, -8), 1)
+            pg.draw.rect(screen, (255,0,0,75), rect.inflate(-10, -10), 1)
         
         # draw the targeted outline only if player ship has sensors above power level 2
-        if ((not self._enemy_ship and self.parent.installed_systems["sensors"].power >= 2) or self._enemy_ship) and len(self.targeted_by) > 0:
-            pg.draw.rect(screen, (125,0,0,255), self.rect.inflate(-4, -4), 1)
-            pg.draw.rect(screen, (125,0,0,150), self.rect.inflate(-8, -8), 1)
+        if self._bitmap_targeted:
+            pg.draw.rect(screen, (125,0,0,255), rect.inflate(-4, -4), 1)
+            pg.draw.rect(screen, (125,0,0,150), rect.inflate(-8, -8), 1)
 
     def place_upgrade(self, upgrade_type: str, orientation: str, upgrade_name: str) -> None:
         """
@@ -208,6 +268,7 @@ class Room(pg.sprite.Group):
         else: # invalid upgrade name
             self.upgrade_slots[self._upgrade_index] = UpgradeSlot(upgrade_pos, orientation, textures["upgrade_slot"], self, upgrade_type)
         
+        self.parent.upgrade_placed(self.upgrade_slots[self._upgrade_index])
         self._upgrade_index += 1
 
         return
@@ -240,6 +301,26 @@ class Room(pg.sprite.Group):
         # no free tile was found
         return None
 
+    def get_inner_path(self, start_tile: Tile, end_tile: Tile) -> Union[list[Tile], None]:
+        """
+        Return the path between two tiles of this room, memoized since the room layout doesn't change.
+        :param start_tile: Tile - the start tile
+        :param end_tile: Tile - the end tile
+        :return: Union[list[Tile], None] - the path including both tiles or None if there is no path
+        """
+
+        key = (start_tile.pos, end_tile.pos)
+        if key not in self._inner_paths:
+            relative_path = astar_pathfinding(self.room_layout, start_tile.pos, end_tile.pos)
+            if relative_path is None:
+                self._inner_paths[key] = self._inner_paths[key[::-1]] = None
+            else:
+                path = [self.room_tile_layout[pos[0]][pos[1]] for pos in relative_path]
+                self._inner_paths[key] = path
+                self._inner_paths[key[::-1]] = path[::-1]
+
+        return self._inner_paths[key]
+
     def check_hover(self, mouse_pos: tuple[int, int]) -> None:
         # TODO: highlight tiles if the mouse is hovering over the room
         return
@@ -253,10 +334,44 @@ class Room(pg.sprite.Group):
         if not mouse_clicked[2]:
             return
 
-        for tile in self.sprites():
-            if isinstance(tile, Tile):
-                if tile.selected == False and tile.occupied == False and tile.hitbox.collidepoint(mouse_pos):
-                    return tile
+        for tile in self.parent.sprites_at(mouse_pos, Tile, hitbox=True):
+            if tile.parent_room is self and tile.selected == False and tile.occupied == False:
+                return tile
+
+    @property
+    def selected(self) -> bool:
+        return self._selected
+
+    @selected.setter
+    def selected(self, value: bool) -> None:
+        if value != self._selected:
+            self._selected = value
+            self.invalidate()
+
+    @property
+    def hovering(self) -> bool:
+        return self._hovering
+
+    @hovering.setter
+    def hovering(self, value: bool) -> None:
+        if value != self._hovering:
+            self._hovering = value
+            self.invalidate()
+
+    @property
+    def aimed_at(self) -> bool:
+        return self._aimed_at
+
+    @aimed_at.setter
+    def aimed_at(self, value: bool) -> None:
+        if value != self._aimed_at:
+            self._aimed_at = value
+            self.invalidate()
+
+    @property
+    def hitbox(self) -> pg.Rect:
+        """The room's rect on screen."""
+        return self.parent.transform.hitbox_of(self)
 
     @property
     def empty_upgrade_slots(self) -> Union[list[UpgradeSlot], None]:
@@ -339,6 +454,7 @@ class Room(pg.sprite.Group):
                 ):
 
                 self._power += change * 2 if self.role == "shields" else change
+                self.parent.system_power_changed(self, change * 2 if self.role == "shields" else change)
 
                 if self.role == "shields":
                     if self.parent.installed_shield is not None and self.parent.installed_shield.curr_charge > 0:
@@ -378,6 +494,7 @@ class Room(pg.sprite.Group):
                 elif value < self._health and self.power >= self._health:
                     self.power = value
 
+                self.parent.system_health_changed(self, value - self._health)
                 self._health = value
 
                 if self._health == self.max_power: # normal
@@ -417,9 +534,9 @@ class Room(pg.sprite.Group):
         if icon is not None:
             if self._enemy_ship:
                 self._icon = pg.sprite.Sprite()
-                self._icon.image = icon.image.copy()
-                self._icon.image = pg.transform.rotate(self._icon.image, 270)
+                self._icon.image = transform_cache.rotate(icon.image, 270)
                 self._icon.rect = self._icon.image.get_rect()
             else:
                 self._icon = icon
+            self.invalidate()
         return
@@ -0,0 +1,108 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING, Union
+import numpy as np
+
+if TYPE_CHECKING:
+    from modules.spaceship.room import Room
+    from modules.spaceship.tile import Tile
+    from modules.spaceship.ship_template import ShipTemplate
+
+class ShipGrid:
+    """
+    Ship-wide grid model built from a ship template. Every array is indexed [x, y] in tiles,
+    the same way as Room.room_layout.
+    """
+
+    # public
+    size: tuple[int, int]
+    walkable: np.ndarray    # bool, the cell is a walkable tile
+    room_id: np.ndarray     # int16, index of the room in the layout or -1
+    occupied: np.ndarray    # bool, a crewmate stands on the tile
+    door_east: np.ndarray   # bool, a passable door between (x, y) and (x+1, y)
+    door_south: np.ndarray  # bool, a passable door between (x, y) and (x, y+1)
+    tiles: np.ndarray       # object, the Tile sprite of every cell
+
+    def __init__(self, template: ShipTemplate) -> None:
+        """
+        :param template: ShipTemplate - the compiled layout of the ship
+        """
+        rooms = [((room.pos[0] // 32, room.pos[1] // 32), room.layout) for room in template.rooms]
+        width = max(pos[0] + len(layout) for pos, layout in rooms)
+        height = max(pos[1] + len(layout[0]) for pos, layout in rooms)
+        self.size = (width, height)
+
+        self.walkable = np.zeros(self.size, dtype=bool)
+        self.room_id = np.full(self.size, -1, dtype=np.int16)
+        self.occupied = np.zeros(self.size, dtype=bool)
+        self.door_east = np.zeros((width - 1, height), dtype=bool)
+        self.door_south = np.zeros((width, height - 1), dtype=bool)
+        self.tiles = np.full(self.size, None, dtype=object)
+
+        for index, ((x, y), layout) in enumerate(rooms):
+            cells = np.array(layout) == 1
+            self.walkable[x:x + cells.shape[0], y:y + cells.shape[1]] = cells
+            self.room_id[x:x + cells.shape[0], y:y + cells.shape[1]] = np.where(cells, index, -1)
+
+    def bind_rooms(self, rooms: list[Room]) -> None:
+        """
+        Link the grid cells to the tile sprites of the built rooms.
+        :param rooms: list[Room] - the ship's rooms, in layout order
+        """
+        for room in rooms:
+            for collumn in room.room_tile_layout:
+                for tile in collumn:
+                    self.tiles[self.cell_of(tile)] = tile
+
+    def cell_of(self, tile: Tile) -> tuple[int, int]:
+        """
+        Return the grid cell of a tile.
+        :param tile: Tile - the tile
+        """
+        room_pos = tile.parent_room.pos
+        return (room_pos[0] // 32 + tile.pos[0], room_pos[1] // 32 + tile.pos[1])
+
+    def set_occupied(self, tile: Tile, value: bool) -> None:
+        """
+        Mirror Tile.occupied into the grid.
+        :param tile: Tile - the tile that changed
+        :param value: bool - the new occupied state
+        """
+        self.occupied[self.cell_of(tile)] = value
+
+    def set_door(self, tile1: Tile, tile2: Tile, passable: bool) -> None:
+        """
+        Mark the edge between two neighbouring tiles as a (passable or closed) door.
+        :param tile1: Tile - first tile connected by the door
+        :param tile2: Tile - second tile connected by the door
+        :param passable: bool - whether crewmates can walk through the door
+        """
+        (x1, y1), (x2, y2) = sorted((self.cell_of(tile1), self.cell_of(tile2)))
+        if y1 == y2 and x2 == x1 + 1:
+            self.door_east[x1, y1] = passable
+        elif x1 == x2 and y2 == y1 + 1:
+            self.door_south[x1, y1] = passable
+        else:
+            print("Could not set door: The tiles are not neighbours!")
+
+    def free_cells(self, room_ids: list[int] = None) -> np.ndarray:
+        """
+        Return the cells that are walkable and not occupied, optionally limited to some rooms.
+        :param room_ids: list[int] - the rooms to search in (optional)
+        :return: np.ndarray - array of (x, y) cells
+        """
+        mask = self.walkable & ~self.occupied
+        if room_ids is not None:
+            mask &= np.isin(self.room_id, room_ids)
+        return np.argwhere(mask)
+
+    def cell_at(self, offset: tuple[int, int], pos: tuple[int, int]) -> Union[tuple[int, int], None]:
+        """
+        Return the walkable cell under a pixel position.
+        :param offset: tuple[int, int] - the pixel position of the grid's (0, 0) cell
+        :param pos: tuple[int, int] - the pixel position to test
+        """
+        x = int((pos[0] - offset[0]) // 32)
+        y = int((pos[1] - offset[1]) // 32)
+        if 0 <= x < self.size[0] and 0 <= y < self.size[1] and self.walkable[x, y]:
+            return (x, y)
+        return None
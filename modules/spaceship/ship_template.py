@@ -0,0 +1,144 @@
+from typing import NamedTuple, Union
+from os import path, makedirs
+import hashlib
+import json
+
+import pygame as pg
+
+from modules.resources import ship_layouts
+from modules.misc.adjacency import find_adjacent_rects, shared_wall_tiles
+
+# bump when the template format or the compiler changes, old cache files are ignored
+TEMPLATE_VERSION = 1
+
+_CACHE_DIR = path.abspath(path.join(path.dirname(path.realpath(__file__)), "..", "..", "cache", "ship_templates"))
+
+class RoomTemplate(NamedTuple):
+    pos: tuple[int, int] # in pixels
+    layout: tuple[tuple[int, ...], ...]
+    role: Union[str, None]
+    level: int
+    upgrade_slots: tuple[tuple[str, str, Union[str, None]], ...] # (upgrade type, orientation, upgrade name)
+
+    def upgrade_slots_dict(self) -> dict[str, dict[str, Union[str, None]]]:
+        """Return the upgrade slots in the ship_layouts format expected by Room."""
+        slots = {}
+        for upgrade_type, orientation, upgrade_name in self.upgrade_slots:
+            slots.setdefault(upgrade_type, {})[orientation] = upgrade_name
+        return slots
+
+class DoorTemplate(NamedTuple):
+    room1: int
+    tile1: tuple[int, int]
+    room2: int
+    tile2: tuple[int, int]
+    vertical: bool
+
+class ShipTemplate(NamedTuple):
+    """Everything about a ship type that doesn't depend on where or how often the ship is spawned."""
+
+    key: str
+    rooms: tuple[RoomTemplate, ...]
+    doors: tuple[DoorTemplate, ...]
+    corners: tuple[tuple[int, int], tuple[int, int]] # top left and bottom right corner in pixels, before any offset
+
+    def to_json(self) -> str:
+        return json.dumps(self)
+
+    @classmethod
+    def from_json(cls, data: str) -> "ShipTemplate":
+        key, rooms, doors, corners = json.loads(data)
+        return cls(
+            key,
+            tuple(RoomTemplate(
+                tuple(pos),
+                tuple(tuple(collumn) for collumn in layout),
+                role,
+                level,
+                tuple(tuple(slot) for slot in upgrade_slots)
+                ) for pos, layout, role, level, upgrade_slots in rooms),
+            tuple(DoorTemplate(room1, tuple(tile1), room2, tuple(tile2), vertical) for room1, tile1, room2, tile2, vertical in doors),
+            (tuple(corners[0]), tuple(corners[1]))
+            )
+
+_templates: dict[str, ShipTemplate] = {} # by layout hash
+# by ship type, so spawning a known ship type doesn't hash its layout again, layouts are not changed once registered
+_ship_type_templates: dict[str, ShipTemplate] = {}
+
+def layout_hash(layout: dict) -> str:
+    """Return a hash of a ship layout's content (and the template version)."""
+    content = json.dumps(layout, sort_keys=True, default=list)
+    return hashlib.sha256(f"{TEMPLATE_VERSION}:{content}".encode("utf-8")).hexdigest()
+
+def compile_ship_template(ship_type: str, key: str = None) -> ShipTemplate:
+    """
+    Compile a ship layout into a template.
+    :param ship_type: str - the name of the layout in ship_layouts
+    :param key: str - the layout's hash, computed if not given
+    """
+    layout = ship_layouts[ship_type]
+    key = key if key is not None else layout_hash(layout)
+
+    rooms = []
+    for room in layout["rooms"]:
+        upgrade_slots = room["upgrade_slots"] if "upgrade_slots" in room else {}
+        rooms.append(RoomTemplate(
+            (room["pos"][0]*32, room["pos"][1]*32),
+            tuple(tuple(collumn) for collumn in room["tiles"]),
+            room["role"] if "role" in room else None,
+            room["level"] if "level" in room else 0,
+            tuple((upgrade_type, orientation, upgrade_name)
+                  for upgrade_type, orientations in upgrade_slots.items()
+                  for orientation, upgrade_name in orientations.items())
+            ))
+
+    rects = [pg.Rect(room.pos, (len(room.layout)*32, len(room.layout[0])*32)) for room in rooms]
+    doors = []
+    for index1, index2, vertical in find_adjacent_rects(rects):
+        tile1, tile2 = shared_wall_tiles(rects[index1], rects[index2])
+        doors.append(DoorTemplate(index1, tile1, index2, tile2, vertical))
+
+    corners = (
+        (min(rect.left for rect in rects), min(rect.top for rect in rects)),
+        (max(rect.right for rect in rects), max(rect.bottom for rect in rects))
+        )
+
+    return ShipTemplate(key, tuple(rooms), tuple(doors), corners)
+
+def get_ship_template(ship_type: str) -> ShipTemplate:
+    """
+    Return the template of a ship type, from memory, the on-disk cache or by compiling it.
+    :param ship_type: str - the name of the layout in ship_layouts
+    """
+    template = _ship_type_templates.get(ship_type)
+    if template is not None:
+        return template
+
+    key = layout_hash(ship_layouts[ship_type])
+    template = _templates.get(key)
+    if template is not None:
+        _ship_type_templates[ship_type] = template
+        return template
+
+    cache_file = path.join(_CACHE_DIR, f"{key}.json")
+    template = None
+    if path.exists(cache_file):
+        try:
+            with open(cache_file, "r", encoding="utf-8") as file:
+                template = ShipTemplate.from_json(file.read())
+        except (OSError, ValueError, TypeError):
+            print(f"Could not load ship template cache for {ship_type}: Recompiling!")
+            template = None
+
+    if template is None or template.key != key:
+        template = compile_ship_template(ship_type, key)
+        try:
+            makedirs(_CACHE_DIR, exist_ok=True)
+            with open(cache_file, "w", encoding="utf-8") as file:
+                file.write(template.to_json())
+        except OSError:
+            print(f"Could not save ship template cache for {ship_type}!")
+
+    _templates[key] = template
+    _ship_type_templates[ship_type] = template
+    return template
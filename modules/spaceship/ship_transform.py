@@ -0,0 +1,130 @@
+from typing import Union
+import pygame as pg
+
+from modules.misc.transform_cache import transform_cache
+
+class ShipTransform:
+    """
+    Maps ship space (where the rooms, tiles, doors and crewmates of a ship live, it never changes when the ship moves)
+    to draw space (where the ship's logic places it, e.g. projectiles), view space (the surface the ship is
+    actually rendered on, rotated for the enemy) and screen space (where that surface ends up, and the mouse is).
+    """
+
+    # public
+    offset: tuple[int, int] # ship space -> draw space
+    screen_pos: tuple[int, int] # position of the draw surface on the screen
+    rotated: bool # view space is draw space rotated 90 degrees counterclockwise
+    surface_width: int # width of the draw surface, the height of the view surface if rotated
+    version: int # bumped on every change, anything derived from the transform can be cached against it
+
+    # private
+    _screen_rects: dict[object, pg.Rect]
+
+    def __init__(self, screen_pos: tuple[int, int] = (0, 0), rotated: bool = False, surface_width: int = 0) -> None:
+        """
+        :param screen_pos: tuple[int, int] - the position of the view surface on the screen
+        :param rotated: bool - if the view is rotated 90 degrees counterclockwise (the enemy ship)
+        :param surface_width: int - the width of the draw surface, only needed if rotated
+        """
+        self.offset = (0, 0)
+        self.screen_pos = screen_pos
+        self.rotated = rotated
+        self.surface_width = surface_width
+        self.version = 0
+        self._screen_rects = {}
+
+    def move(self, distance: tuple[int, int]) -> None:
+        """
+        Move the ship on its draw surface.
+        :param distance: tuple[int, int] - the distance in draw space
+        """
+        self.offset = (round(self.offset[0] + distance[0]), round(self.offset[1] + distance[1])) # rects only take whole pixels
+        self._changed()
+
+    def place_on_screen(self, screen_pos: tuple[int, int]) -> None:
+        """
+        Move the ship's view surface on the screen.
+        :param screen_pos: tuple[int, int] - the new position of the view surface
+        """
+        self.screen_pos = screen_pos
+        self._changed()
+
+    def to_draw(self, pos: tuple[int, int]) -> tuple[int, int]:
+        """Map a point from ship space to draw space."""
+        return (pos[0] + self.offset[0], pos[1] + self.offset[1])
+
+    def to_draw_rect(self, rect: pg.Rect) -> pg.Rect:
+        """Map a rect from ship space to draw space."""
+        return rect.move(self.offset)
+
+    def from_draw(self, pos: tuple[int, int]) -> tuple[int, int]:
+        """Map a point from draw space to ship space."""
+        return (pos[0] - self.offset[0], pos[1] - self.offset[1])
+
+    def rotate_point(self, pos: tuple[int, int]) -> tuple[int, int]:
+        """Map a point from draw space to view space."""
+        if self.rotated: # pixel columns become rows, the last column ends up in the first row
+            return (pos[1], self.surface_width - 1 - pos[0])
+        return pos
+
+    def rotate_rect(self, rect: pg.Rect) -> pg.Rect:
+        """Map a rect from draw space to view space."""
+        if self.rotated:
+            return pg.Rect(rect.y, self.surface_width - rect.x - rect.width, rect.height, rect.width)
+        return rect.copy()
+
+    def to_view_rect(self, rect: pg.Rect) -> pg.Rect:
+        """Map a rect from ship space to view space."""
+        return self.rotate_rect(rect.move(self.offset))
+
+    def view_image(self, image: pg.Surface) -> pg.Surface:
+        """Return an image as it appears in view space, rotated images are cached for as long as the original exists."""
+        if not self.rotated:
+            return image
+        return transform_cache.rotate(image, 90)
+
+    def draw_size(self, view_surface: pg.Surface) -> tuple[int, int]:
+        """Return the size of a view surface in draw space."""
+        size = view_surface.get_size()
+        return size[::-1] if self.rotated else size
+
+    def to_screen(self, pos: tuple[int, int]) -> tuple[int, int]:
+        """Map a point from ship space to screen space."""
+        x, y = self.rotate_point(self.to_draw(pos))
+        return (x + self.screen_pos[0], y + self.screen_pos[1])
+
+    def to_screen_rect(self, rect: pg.Rect) -> pg.Rect:
+        """Map a rect from ship space to screen space."""
+        return self.to_view_rect(rect).move(self.screen_pos)
+
+    def from_screen(self, pos: tuple[int, int]) -> tuple[int, int]:
+        """Map a point from screen space to ship space."""
+        x, y = pos[0] - self.screen_pos[0], pos[1] - self.screen_pos[1]
+        if self.rotated:
+            x, y = self.surface_width - 1 - y, x
+        return self.from_draw((x, y))
+
+    def from_view_rect(self, rect: pg.Rect) -> pg.Rect:
+        """Map a rect from view space to ship space."""
+        if self.rotated:
+            return pg.Rect(self.from_draw((self.surface_width - rect.y - rect.height, rect.x)), (rect.height, rect.width))
+        return pg.Rect(self.from_draw(rect.topleft), rect.size)
+
+    def from_screen_rect(self, rect: pg.Rect) -> pg.Rect:
+        """Map a rect from screen space to ship space."""
+        return self.from_view_rect(rect.move(-self.screen_pos[0], -self.screen_pos[1]))
+
+    def hitbox_of(self, sprite: Union[pg.sprite.Sprite, pg.sprite.Group]) -> pg.Rect:
+        """
+        Return the screen space rect of a sprite (or room) that doesn't move inside the ship,
+        cached until the transform changes.
+        :param sprite: Union[pg.sprite.Sprite, pg.sprite.Group] - anything with a ship space rect
+        """
+        hitbox = self._screen_rects.get(sprite)
+        if hitbox is None:
+            hitbox = self._screen_rects[sprite] = self.to_screen_rect(sprite.rect)
+        return hitbox
+
+    def _changed(self) -> None:
+        self.version += 1
+        self._screen_rects.clear()
@@ -2,14 +2,23 @@ import pygame as pg
 from typing import Union
 from random import randint
 from collections import OrderedDict
+from heapq import heappush, heappop
+from itertools import count
 
 from modules.spaceship.room import Room
 from modules.spaceship.door import Door
 from modules.spaceship.tile import Tile
+from modules.spaceship.ship_grid import ShipGrid
+from modules.spaceship.ship_template import ShipTemplate, get_ship_template
+from modules.spaceship.ship_transform import ShipTransform
 from modules.spaceship.upgrades import *
-from modules.misc.pathfinding import astar_pathfinding
+from modules.misc.routing import RoutingTable, build_flow_field
+from modules.misc.reservations import ReservationTable, cooperative_astar
+from modules.misc.path_service import PathService
+from modules.misc.spatial_hash import SpatialHash
+from modules.misc.adjacency import shared_wall_tiles
 from modules.crewmate import Crewmate
-from modules.resources import GameEvents, CrewmateRaces, crewmate_names, ship_layouts, systems
+from modules.resources import GameEvents, CrewmateRaces, crewmate_names, systems, GLOBAL_DEBUG_OPTIONS
 
 class Spaceship:
     # public
@@ -17,6 +26,11 @@ class Spaceship:
     doors: pg.sprite.Group
     crewmates: pg.sprite.Group
     rooms: list[Room]
+    selected_tiles: set[Tile] # tiles showing the destination marker
+    template: ShipTemplate
+    transform: ShipTransform
+    grid: ShipGrid
+    sprite_index: SpatialHash
     projectiles: list[Projectile]
     installed_systems: OrderedDict[str, Room]
     installed_thrusters: dict[str, Thruster]
@@ -26,6 +40,14 @@ class Spaceship:
     event_queue: list[GameEvents]
     autofire: bool
     enemy: bool
+    cooperative_pathing: bool
+    reservations: ReservationTable
+    async_pathing: bool
+
+    # ships with at least this many rooms are pathed room by room
+    HIERARCHICAL_PATHING_ROOMS = 50
+    # how many steps ahead cooperative paths respect the reservations of other crewmates
+    COOPERATIVE_WINDOW = 32
 
     # private
     _room_enine: Union[Room, None]
@@ -36,14 +58,31 @@ class Spaceship:
     _destroy_anim_index: int
     _destroy_anim_ticks: int
 
-    _display_offset: tuple[int, int]
+    _nav_graph: Union[dict[Tile, list[Tile]], None]
+    _routing_table: Union[RoutingTable, None]
+    _flow_fields: dict[Room, dict[Tile, Union[Tile, None]]]
+    _nav_frame: int
+    _nav_time: float
+    _nav_version: int
+    _path_service: Union[PathService, None]
+    _spatial_index_dirty: bool
+    _drawn_sprites: dict[object, tuple] # what was drawn of the animated and moving sprites, for collect_dirty
+    _drawn_version: int # the transform version the view was last drawn with
+
+    # registry, kept up to date by the rooms
+    _power_usage: int
+    _system_health: int
+    _damaged_systems: dict[Room, None]
+    _weapons: list[Weapon]
+    _thrusters: list[Thruster]
+    _empty_slots: list[UpgradeSlot]
 
     def __init__(self, ship_type: str, screen_size: tuple[int, int], enemy: bool = False, offset: tuple[int, int] = (0,0)) -> None:
         """
         :param ship_type: str - The type of the spaceship.
         :param screen_size: tuple[int, int] - The size of the screen the ship is rendered on.
         :param enemy: bool - If the spaceship is an enemy.
-        :param offset: tuple[int, int] - The offset of the spaceship.
+        :param offset: tuple[int, int] - The position of the surface the ship is drawn on, on the screen.
         """
         self.screen_size = screen_size
         self.doors = pg.sprite.Group()
@@ -58,34 +97,57 @@ class Spaceship:
         self._room_oxygen = None
         self._room_pilot = None
         self.rooms = []
+        self.selected_tiles = set()
+        self._nav_graph = None
+        self._routing_table = None
+        self._flow_fields = {}
+        self.cooperative_pathing = False
+        self.reservations = ReservationTable()
+        self._nav_frame = 0
+        self._nav_time = 0
+        self._nav_version = 0
+        self.async_pathing = False
+        self._path_service = None
 
         # required data about these systems
         self.installed_systems = {}
         self.installed_thrusters = {}
         self.installed_shield = None
+
+        self._power_usage = 0
+        self._system_health = 0
+        self._damaged_systems = {}
+        self._weapons = []
+        self._thrusters = []
+        self._empty_slots = []
         
         self.hull_hp = 30
         self.destroyed = False
         self._destroy_anim_ticks = 300
 
-        offset = offset[::-1] if self.enemy else offset
-        for room in ship_layouts[ship_type]["rooms"]:
-            room_pos = (room["pos"][0]*32, room["pos"][1]*32)
-            room_pos_offset = (room_pos[0] + offset[0], room_pos[1] + offset[1])
-            room_pos_offset = room_pos_offset[::-1] if enemy else room_pos_offset
+        self.template = get_ship_template(ship_type)
+        # the enemy's surface is rotated onto the screen, so its width is the screen's height
+        self.transform = ShipTransform(offset, rotated=enemy, surface_width=screen_size[1])
+        self.grid = ShipGrid(self.template)
+        self.sprite_index = SpatialHash()
+        self._spatial_index_dirty = True
+        self._drawn_sprites = {}
+        self._drawn_version = -1
 
+        for room in self.template.rooms:
             self.rooms.append(Room(
-                room_pos,
-                room_pos_offset,
-                room["tiles"],
+                room.pos,
+                room.layout,
                 self,
-                role=room["role"] if "role" in room else None,
-                level=room["level"] if "level" in room else 0,
-                upgrade_slots=room["upgrade_slots"] if "upgrade_slots" in room else {},
+                role=room.role,
+                level=room.level,
+                upgrade_slots=room.upgrade_slots_dict(),
                 enemy_ship=enemy
             ))
-            if "role" in room and room["role"] in systems:
-                self.installed_systems[room["role"]] = self.rooms[-1]
+            if room.role in systems:
+                self.installed_systems[room.role] = self.rooms[-1]
+        self._load_registry(self._count_registry())
+        self.grid.bind_rooms(self.rooms)
 
         # find and power essential systems
         for system_name in systems:
@@ -108,57 +170,119 @@ class Spaceship:
         self.installed_systems = OrderedDict((k, self.installed_systems[k]) for k in temp_systems)
         del temp_systems
 
-        if enemy: # flip all the rooms hitboxes horizontally and offset them
-            centery = self.get_center()[0]
-            corners = self.get_corners()
-            offset_y = self.screen_size[1] - corners[1][0]
-
-            for room in self.rooms:
-                hitbox_y = room.hitbox.centery
-                room.hitbox.centery = 2*centery - hitbox_y + offset_y
+        if self.installed_shield is not None: # the shield surrounds the whole ship, in ship space
+            corners = self.template.corners
+            self.installed_shield.post_init_update(corners, ((corners[0][0] + corners[1][0])/2, (corners[0][1] + corners[1][1])/2))
 
         self.spawn_crewmate("pilot")
         self.spawn_crewmate("shields")
         self.spawn_crewmate("weapons")
 
-    def draw(self, screen: pg.Surface) -> None:
+    def draw(self, screen: pg.Surface, regions: list[pg.Rect] = None) -> None:
         """
-        Draw's the spaceship and it's components on screen.
+        Draw's the spaceship and it's components on screen, already in the orientation of its view.
         :param screen: The screen to draw the spaceship on.
-        :param enemy_screen: pg.Surface - The screen of the enemy.
+        :param regions: list[pg.Rect] - only clear and redraw these view space regions of the screen (optional)
         """
 
-        for group in self.rooms:
-            group.draw(screen)
+        view = self.transform
 
-        self.doors.draw(screen)
+        if regions is None:
+            rooms, doors, crewmates = self.rooms, self.doors, self.crewmates
+        else:
+            found = set()
+            for region in regions:
+                found.update(self.sprites_in(view.from_view_rect(region)))
+            # upgrade slots stick out of their rooms, so the room has to be drawn with them
+            found.update([sprite.parent_room for sprite in found if isinstance(sprite, UpgradeSlot)])
 
-        for crewmate in self.crewmates:
-            crewmate.draw(screen)
+            # keep the drawing order of a full redraw, overlapping sprites end up the same way
+            rooms = [room for room in self.rooms if room in found]
+            doors = [door for door in self.doors if door in found]
+            crewmates = [crewmate for crewmate in self.crewmates if crewmate in found]
+
+        for region in regions if regions is not None else (None,):
+            if region is not None:
+                screen.set_clip(region)
+                screen.fill((0,0,0))
+
+            for group in rooms:
+                group.draw(screen)
+
+            for door in doors:
+                screen.blit(view.view_image(door.image), view.to_view_rect(door.rect))
+
+            for crewmate in crewmates:
+                crewmate.draw(screen)
 
-        if self.installed_shield is not None:
-            self.installed_shield.draw(screen)
+            if self.installed_shield is not None:
+                self.installed_shield.draw(screen)
+        screen.set_clip(None)
+
+    def collect_dirty(self) -> Union[list[pg.Rect], None]:
+        """
+        Bring the rooms' bitmaps up to date and return the view space regions that changed since the last call.
+        :return: Union[list[pg.Rect], None] - the changed regions, None if the whole view has to be redrawn
+        """
+
+        view = self.transform
+        full = view.version != self._drawn_version
+        self._drawn_version = view.version
+
+        dirty = [view.to_view_rect(room.rect) for room in self.rooms if room.refresh()]
+
+        # the animated and moving sprites are compared with what was drawn the last time
+        drawn = {}
+        for room in self.rooms:
+            for slot in room.upgrade_slots.values():
+                drawn[slot] = (slot.image, view.to_view_rect(slot.rect))
+        for door in self.doors:
+            drawn[door] = (door.image, view.to_view_rect(door.rect))
+        for crewmate in self.crewmates:
+            drawn[crewmate] = (crewmate.image, view.to_view_rect(crewmate.rect), crewmate.awaiting_path)
+        if self.installed_shield is not None and hasattr(self.installed_shield, "shield_sprite"):
+            shield = self.installed_shield
+            drawn[shield] = (shield.shield_sprite.image, view.to_view_rect(shield.shield_sprite.rect), shield.charge > 0)
+
+        for sprite, state in drawn.items():
+            previous = self._drawn_sprites.pop(sprite, None)
+            if previous != state:
+                dirty.append(state[1])
+                if previous is not None and previous[1] != state[1]:
+                    dirty.append(previous[1])
+        for previous in self._drawn_sprites.values(): # sprites that are gone
+            dirty.append(previous[1])
+        self._drawn_sprites = drawn
+
+        return None if full else dirty
     
-    def draw_projectiles(self, screen: pg.Surface, enemy_screen: pg.Surface) -> None:
+    def draw_projectiles(self, screen: pg.Surface, enemy_screen: pg.Surface) -> tuple[list[pg.Rect], list[pg.Rect]]:
         """
         Draws the projectiles on the given screen.
         :param screen: pg.Surface - The screen to draw the projectiles on.
         :param enemy_screen: pg.Surface - The screen of the enemy.
+        :return: tuple[list[pg.Rect], list[pg.Rect]] - the areas drawn on the screen and on the enemy's screen
         """
+        drawn, enemy_drawn = [], []
         for projectile in self.projectiles:
             v_pos = projectile.position()
+            # projectiles fly in draw space, the enemy's view is rotated
+            enemy_view = projectile.target_ship.transform
 
-            if v_pos[0] >= screen.get_width() and not projectile.switched_screens:
+            if v_pos[0] >= self.transform.draw_size(screen)[0] and not projectile.switched_screens:
                 projectile.switched_screens = True
+                enemy_size = enemy_view.draw_size(enemy_screen)
                 projectile.update_vectors((
-                    enemy_screen.get_width(),
-                    enemy_screen.get_height()//2  + randint(-25, 25)
+                    enemy_size[0],
+                    enemy_size[1]//2  + randint(-25, 25)
                 ))
 
             if projectile.switched_screens:
-                projectile.draw(enemy_screen)
+                enemy_drawn += projectile.draw(enemy_screen, enemy_view)
             else:
-                projectile.draw(screen)
+                drawn += projectile.draw(screen, self.transform)
+
+        return drawn, enemy_drawn
 
     def update(self, dt: float) -> list[GameEvents]:
         if self.hull_hp <= 0 or self.destroyed:
@@ -176,6 +300,14 @@ class Spaceship:
             else:
                 projectile.update(dt)
 
+        self._nav_frame += 1
+        self._nav_time += dt
+        if self._nav_frame % 600 == 0: # forget old reservations every few seconds
+            self.reservations.purge(self.nav_step)
+
+        if self._path_service is not None and self._path_service.pending > 0:
+            self._path_service.deliver(self.nav_graph, self._nav_version)
+
         self.crewmates.update(dt)
         self.doors.update()
 
@@ -202,28 +334,12 @@ class Spaceship:
 
     def get_corners(self) -> tuple[tuple[int, int], tuple[int, int]]:
         """
-        Return the top left and bottom right corners of the spaceship in pixels.
+        Return the top left and bottom right corners of the spaceship in pixels, on the surface it's drawn on.
         :return tuple[tuple[int, int], tuple[int, int]] - The top left and bottom right corners of the spaceship.
         """
 
-        lowest_x = None
-        lowest_y = None
-
-        highest_x = None
-        highest_y = None
-
-        # find the lowest x and y values
-        for room in self.rooms:
-            if lowest_x is None or room.rect.left < lowest_x:
-                lowest_x = room.rect.left
-            if  lowest_y is None or room.rect.top < lowest_y:
-                lowest_y = room.rect.top
-            if highest_x is None or room.rect.right > highest_x:
-                highest_x = room.rect.right
-            if highest_y is None or room.rect.bottom > highest_y:
-                highest_y = room.rect.bottom
-
-        return (lowest_x, lowest_y), (highest_x, highest_y)
+        lowest, highest = self.template.corners
+        return self.transform.to_draw(lowest), self.transform.to_draw(highest)
 
     def get_center(self) -> tuple[int, int]:
         """
@@ -240,129 +356,131 @@ class Spaceship:
         Move the spaceship by a distance in pixels.
         :param distance: The distance to move the spaceship by.
         """
-        hitbox_distance = (distance[1], -distance[0]) if self.enemy else distance
+        self.transform.move(distance)
 
-        for room in self.rooms:
-            room.rect.move_ip(distance)
-            room.hitbox.move_ip(hitbox_distance)
+    def connect_rooms(self, room1: Room, room2: Room) -> tuple[Tile, Tile]:
+        """
+        Connect adjecent rooms with doors.
+        :param room1: modules.Room - The first room to connect.
+        :param room2: modules.Room - The second room to connect.
+        :return tuple[modules.Tile, modules.Tile] - The two tiles that are connected.
+        """
 
-            for tile in room.sprites():
-                tile.rect.move_ip(distance)
-                tile.hitbox.move_ip(hitbox_distance) if hasattr(tile, "hitbox") else None
+        # the door sits at the start of the wall both rooms share
+        (x1, y1), (x2, y2) = shared_wall_tiles(room1.rect, room2.rect)
+        return room1.room_tile_layout[x1][y1], room2.room_tile_layout[x2][y2]
 
-        for door in self.doors:
-            door.rect.move_ip(distance)
-            door.hitbox.move_ip(hitbox_distance)
+    def place_doors(self) -> None:
+        """
+        Place doors on the connected rooms inside the spaceship.
+        """
 
-        for crewmate in self.crewmates:
-            crewmate.rect.move_ip(distance)
-            crewmate.hitbox.move_ip(hitbox_distance)
+        # the adjacency of the rooms was found when the ship's template was compiled
+        for door in self.template.doors:
+            room = self.rooms[door.room1]
+            adj_room = self.rooms[door.room2]
+            if adj_room in room.adjecent_rooms:
+                continue
+
+            connected_tiles = (room.room_tile_layout[door.tile1[0]][door.tile1[1]], adj_room.room_tile_layout[door.tile2[0]][door.tile2[1]])
+            room.adjecent_rooms[adj_room] = connected_tiles
+            adj_room.adjecent_rooms[room] = connected_tiles[::-1] # reverse the tuple
+            door_coords = (
+                        (connected_tiles[0].rect.centerx + connected_tiles[1].rect.centerx )/2, 
+                        (connected_tiles[0].rect.centery + connected_tiles[1].rect.centery)/2
+                        )
+            Door(door_coords, self.doors, door.vertical, connected_tiles)
 
-        if self.installed_shield is not None:
-            self.installed_shield.shield_sprite.rect = self.installed_shield.shield_sprite.image.get_rect(center=self.get_center())
+        for door in self.doors:
+            self.index_sprite(door)
+            if door.tiles is not None:
+                self.grid.set_door(*door.tiles, door.passable)
+        self.build_nav_graph()
 
-    def move_hitbox_by_distance(self, distance: tuple[int, int]) -> None:
+    def build_nav_graph(self) -> dict[Tile, list[Tile]]:
         """
-        Move the hitboxes of the spaceship by a distance in pixels.
-        :param distance: The distance to move the hitboxes by.
+        Build the ship-wide navigation graph. Every walkable tile is a node, neighbouring tiles
+        inside a room and tiles connected by a door are edges.
+        :return dict[modules.Tile, list[modules.Tile]] - The adjacency list of the graph.
         """
-        if self.enemy:
-            distance = distance[::-1]    
+
+        graph = {}
 
         for room in self.rooms:
-            room.hitbox.move_ip(distance)
-            for tile in room.sprites():
-                tile.hitbox.move_ip(distance) if hasattr(tile, "hitbox") else None
-        
-        for crewmate in self.crewmates:
-            crewmate.hitbox.move_ip(distance)
-        
+            layout = room.room_layout
+            for x, collumn in enumerate(room.room_tile_layout):
+                for y, tile in enumerate(collumn):
+                    if layout[x][y] != 1:
+                        continue
+
+                    neighbours = []
+                    for nx, ny in ((x, y-1), (x, y+1), (x-1, y), (x+1, y)):
+                        if 0 <= nx < len(layout) and 0 <= ny < len(layout[nx]) and layout[nx][ny] == 1:
+                            neighbours.append(room.room_tile_layout[nx][ny])
+                    graph[tile] = neighbours
+
+        # connect the rooms through their doors
+        for room in self.rooms:
+            for door_tile, adj_door_tile in room.adjecent_rooms.values():
+                if adj_door_tile not in graph[door_tile]:
+                    graph[door_tile].append(adj_door_tile)
+
+        # closed off doors don't connect anything
         for door in self.doors:
-            door.hitbox.move_ip(distance)
+            if not door.passable and door.tiles is not None:
+                for tile1, tile2 in (door.tiles, door.tiles[::-1]):
+                    if tile2 in graph[tile1]:
+                        graph[tile1].remove(tile2)
+
+        self._nav_graph = graph
+        self._nav_version += 1
+        self._routing_table = None
+        self._flow_fields.clear()
+        self.reservations.clear()
+        for crewmate in self.crewmates:
+            crewmate.reset_planner()
+        return graph
+
+    def invalidate_nav_graph(self) -> None:
+        """Mark the navigation graph as outdated, it will be rebuilt on the next path request."""
+        self._nav_graph = None
+        self._nav_version += 1
+        self._routing_table = None
+        self._flow_fields.clear()
+        for crewmate in self.crewmates:
+            crewmate.reset_planner()
 
-    def connect_rooms(self, room1: Room, room2: Room) -> tuple[Tile, Tile]:
+    def set_door_passable(self, door: Door, passable: bool) -> None:
         """
-        Connect adjecent rooms with doors.
-        :param room1: modules.Room - The first room to connect.
-        :param room2: modules.Room - The second room to connect.
-        :return tuple[modules.Tile, modules.Tile] - The two tiles that are connected.
+        Change whether crewmates can walk through a door and patch the navigation data accordingly.
+        :param door: modules.Door - the door to change
+        :param passable: bool - the new passability of the door
         """
-        
-        # TODO: can be optimized
-        # find two tiles that are closest to each other
-        closest_tile1 = None
-        closest_tile2 = None
-        closest_distance = None
-
-        for tile1 in room1.sprites():
-            for tile2 in room2.sprites():
-                distance = (
-                    abs(tile1.rect.centerx - tile2.rect.centerx) + 
-                    abs(tile1.rect.centery - tile2.rect.centery)
-                    )
-                if closest_distance is None or distance < closest_distance:
-                    closest_distance = distance
-                    closest_tile1 = tile1
-                    closest_tile2 = tile2
-
-        return closest_tile1, closest_tile2
 
-    def place_doors(self) -> None:
-        """
-        Place doors on the connected rooms inside the spaceship.
-        """
+        if door.passable == passable:
+            return
+        door.passable = passable
 
-        for room in self.rooms:
-            for adj_room in self.rooms:
-                if room is adj_room:
-                    continue
-                elif adj_room in room.adjecent_rooms:
-                    continue
+        if door.tiles is not None:
+            self.grid.set_door(*door.tiles, passable)
+        if door.tiles is None or self._nav_graph is None:
+            return
+        self._flow_fields.clear()
+
+        self._nav_version += 1
+        tile1, tile2 = door.tiles
+        if passable:
+            self._nav_graph[tile1].append(tile2)
+            self._nav_graph[tile2].append(tile1)
+        else:
+            self._nav_graph[tile1].remove(tile2)
+            self._nav_graph[tile2].remove(tile1)
+
+        if self._routing_table is not None:
+            self._routing_table.edge_changed(tile1, tile2, passable)
 
-                if (room.rect.left == adj_room.rect.right and 
-                        adj_room.rect.top < room.rect.bottom and 
-                        adj_room.rect.bottom > room.rect.top):
-                    connected_tiles = self.connect_rooms(room, adj_room)
-                    room.adjecent_rooms[adj_room] = connected_tiles
-                    adj_room.adjecent_rooms[room] = connected_tiles[::-1] # reverse the tuple
-                    door_coords = (
-                                (connected_tiles[0].rect.centerx + connected_tiles[1].rect.centerx )/2, 
-                                (connected_tiles[0].rect.centery + connected_tiles[1].rect.centery)/2
-                                )
-                    Door(door_coords, self.doors, True)
-                elif (room.rect.right == adj_room.rect.left and 
-                        adj_room.rect.top < room.rect.bottom and 
-                        adj_room.rect.bottom > room.rect.top):
-                    connected_tiles = self.connect_rooms(room, adj_room)
-                    room.adjecent_rooms[adj_room] = connected_tiles
-                    adj_room.adjecent_rooms[room] = connected_tiles[::-1]
-                    door_coords = (
-                                (connected_tiles[0].rect.centerx + connected_tiles[1].rect.centerx )/2, 
-                                (connected_tiles[0].rect.centery + connected_tiles[1].rect.centery)/2
-                                )
-                    Door(door_coords, self.doors, True)
-                elif (room.rect.top == adj_room.rect.bottom and
-                        adj_room.rect.left < room.rect.right and
-                        adj_room.rect.right > room.rect.left):
-                    connected_tiles = self.connect_rooms(room, adj_room)
-                    room.adjecent_rooms[adj_room] = connected_tiles
-                    adj_room.adjecent_rooms[room] = connected_tiles[::-1]
-                    door_coords = (
-                                (connected_tiles[0].rect.centerx + connected_tiles[1].rect.centerx )/2, 
-                                (connected_tiles[0].rect.centery + connected_tiles[1].rect.centery)/2
-                                )
-                    Door(door_coords, self.doors)
-                elif (room.rect.bottom == adj_room.rect.top and
-                        adj_room.rect.left < room.rect.right and
-                        adj_room.rect.right > room.rect.left):
-                    connected_tiles = self.connect_rooms(room, adj_room)
-                    room.adjecent_rooms[adj_room] = connected_tiles
-                    adj_room.adjecent_rooms[room] = connected_tiles[::-1]
-                    door_coords = (
-                                (connected_tiles[0].rect.centerx + connected_tiles[1].rect.centerx )/2, 
-                                (connected_tiles[0].rect.centery + connected_tiles[1].rect.centery)/2
-                                )
-                    Door(door_coords, self.doors)
+        for crewmate in self.crewmates:
+            crewmate.door_changed(tile1, tile2)
 
     def activate_weapon(self, weapon: Weapon) -> bool:
         """
@@ -442,64 +560,345 @@ class Spaceship:
         if name == "NULL":
             name = crewmate_names[race.name.lower()][randint(0, len(crewmate_names)-1)]
 
-        # get a random tile from the origin system, or if occupied pick a random system
-        while origin_system == "NULL" or self.installed_systems[origin_system].get_random_tile().occupied:
-            origin_system = list(self.installed_systems.keys())[randint(0, len(self.installed_systems)-1)]
+        # get a random free tile of the origin system, or if it's full of any system
+        free_cells = []
+        if origin_system in self.installed_systems:
+            free_cells = self.grid.free_cells([self.rooms.index(self.installed_systems[origin_system])])
+        if len(free_cells) == 0:
+            free_cells = self.grid.free_cells([self.rooms.index(room) for room in self.installed_systems.values()])
+            if len(free_cells) == 0:
+                print("Could not spawn crewmate: No free tiles left!")
+                return
         
-        origin_pos = self.installed_systems[origin_system].get_random_tile().rect.topleft
+        origin_pos = self.grid.tiles[tuple(free_cells[randint(0, len(free_cells)-1)])].rect.topleft
         
-        Crewmate(name, self, origin_pos, (0,0), self.crewmates, race, enemy=self.enemy)
+        self.index_sprite(Crewmate(name, self, origin_pos, self.crewmates, race, enemy=self.enemy))
         
         return
 
     def get_path_between_tiles(self, start_tile: Tile, end_tile: Tile) -> list[Tile]:
         """
-        Get the path between two tiles.
+        Get the path between two tiles, large ships search the room graph instead of filling the routing table.
         :param start_tile: modules.Tile - The start tile.
         :param end_tile: modules.Tile - The end tile.
         :return list[modules.Tile] - The path between the two tiles.
         """
 
-        curr_room = None
-        result_path = []
+        if len(self.rooms) >= self.HIERARCHICAL_PATHING_ROOMS:
+            return self.get_hierarchical_path_between_tiles(start_tile, end_tile)
 
-        for room in self.rooms:
-            if start_tile in room.sprites():
-                curr_room = room
-                break
-        
-        while True:
-            # find next best room to move to
-            best_room = None
-            best_dist = pg.math.Vector2(curr_room.rect.topleft).distance_to(pg.math.Vector2(end_tile.rect.topleft))
-            for room in curr_room.adjecent_rooms.keys():
-                if best_room is None or pg.math.Vector2(room.rect.topleft).distance_to(pg.math.Vector2(end_tile.rect.topleft)) < best_dist:
-                    best_dist = pg.math.Vector2(room.rect.topleft).distance_to(pg.math.Vector2(end_tile.rect.topleft))
-                    best_room = room
-
-            # Make path to door between the rooms
-            relative_path = astar_pathfinding(curr_room.room_layout, start_tile.pos, curr_room.adjecent_rooms[best_room][0].pos)
-
-            # transform the relative path into the list[Tile] format
-            for pos in relative_path:
-                result_path.append(curr_room.room_tile_layout[pos[0]][pos[1]])
-
-            #append a list of tiles to the path
-            result_path.append(curr_room.adjecent_rooms[best_room][1])
-            start_tile = curr_room.adjecent_rooms[best_room][1]
-
-            # if the room is the end room, break from the loop
-            curr_room = best_room
-            if end_tile in best_room.sprites():
+        return self.get_route_between_tiles(start_tile, end_tile)
+
+    def get_hierarchical_path_between_tiles(self, start_tile: Tile, end_tile: Tile) -> list[Tile]:
+        """
+        Get the path between two tiles by searching the room graph and stitching together
+        the memoized door-to-door paths inside each room.
+        :param start_tile: modules.Tile - The start tile.
+        :param end_tile: modules.Tile - The end tile.
+        :return list[modules.Tile] - The path between the two tiles.
+        """
+
+        graph = self.nav_graph
+        end_room = end_tile.parent_room
+
+        # search nodes are the tiles a room is entered through
+        tie_breaker = count()
+        open_heap = [(self.tile_distance(start_tile, end_tile), next(tie_breaker), 0, start_tile)]
+        best_cost = {start_tile: 0}
+        came_from = {start_tile: None} # node -> (entry tile of the previous room, tile it was left through)
+        closed_set = set()
+
+        while open_heap:
+            cost, entry = heappop(open_heap)[2:]
+            if entry in closed_set:
+                continue
+            closed_set.add(entry)
+
+            if entry is end_tile:
+                segments = []
+                while came_from[entry] is not None:
+                    previous_entry, exit_tile = came_from[entry]
+                    segment = previous_entry.parent_room.get_inner_path(previous_entry, exit_tile)[1:]
+                    segments.append(segment if exit_tile is entry else segment + [entry])
+                    entry = previous_entry
+
+                path = [start_tile]
+                for segment in reversed(segments):
+                    path.extend(segment)
+                return path
+
+            room = entry.parent_room
+            edges = [(exit_tile, next_entry, 1) for exit_tile, next_entry in room.adjecent_rooms.values() if next_entry in graph[exit_tile]]
+            if room is end_room:
+                edges.append((end_tile, end_tile, 0))
+
+            for exit_tile, next_entry, crossing_cost in edges:
+                inner_path = room.get_inner_path(entry, exit_tile)
+                if inner_path is None or next_entry in closed_set:
+                    continue
+
+                new_cost = cost + len(inner_path) - 1 + crossing_cost
+                if best_cost.get(next_entry, new_cost + 1) <= new_cost:
+                    continue
+                best_cost[next_entry] = new_cost
+                came_from[next_entry] = (entry, exit_tile)
+
+                heappush(open_heap, (new_cost + self.tile_distance(next_entry, end_tile), next(tie_breaker), new_cost, next_entry))
+
+        return []
+
+    def get_route_between_tiles(self, start_tile: Tile, end_tile: Tile) -> list[Tile]:
+        """
+        Get the path between two tiles by walking the precomputed routing table.
+        :param start_tile: modules.Tile - The start tile.
+        :param end_tile: modules.Tile - The end tile.
+        :return list[modules.Tile] - The path between the two tiles.
+        """
+
+        route = self.routing_table.get_route(start_tile, end_tile)
+
+        return route if route is not None else []
+
+    def get_cooperative_path(self, crewmate: Crewmate, start_tile: Tile, end_tile: Tile) -> list[Tile]:
+        """
+        Get a timed path between two tiles that avoids the paths reserved by other crewmates, and reserve it.
+        Every entry of the path takes one step to reach, repeated tiles mean the crewmate waits.
+        Only the first COOPERATIVE_WINDOW steps are reserved, the crewmate replans halfway through them.
+        :param crewmate: modules.Crewmate - The crewmate the path is planned for.
+        :param start_tile: modules.Tile - The start tile.
+        :param end_tile: modules.Tile - The end tile.
+        :return list[modules.Tile] - The timed path between the two tiles.
+        """
+
+        self.reservations.release(crewmate)
+        routing_table = self.routing_table
+
+        path = cooperative_astar(
+            self.nav_graph,
+            start_tile,
+            end_tile,
+            crewmate,
+            self.reservations,
+            self.nav_step,
+            routing_table.distance,
+            blocked=lambda tile: tile.occupied,
+            window=self.COOPERATIVE_WINDOW,
+            routing_table=routing_table
+            )
+
+        if path is None: # no conflict free path was found, fall back to the shortest one
+            return self.get_route_between_tiles(start_tile, end_tile)
+
+        self.reservations.reserve_path(crewmate, path, self.nav_step, self.COOPERATIVE_WINDOW)
+        return path
+
+    def request_path(self, crewmate: Crewmate, start_tile: Tile, end_tile: Tile) -> None:
+        """
+        Ask the path service for a path, it is solved in the background and handed to the crewmate on a later tick.
+        :param crewmate: modules.Crewmate - The crewmate the path is for.
+        :param start_tile: modules.Tile - The start tile.
+        :param end_tile: modules.Tile - The end tile.
+        """
+
+        self.path_service.request(crewmate, start_tile, end_tile, self.nav_graph, self._nav_version)
+
+    def get_flow_field(self, room: Room) -> dict[Tile, Union[Tile, None]]:
+        """
+        Return the flow field towards the given room, cached until the doors or the layout change.
+        :param room: modules.Room - the target room
+        :return dict[modules.Tile, Union[modules.Tile, None]] - the next tile to step on for every tile that can reach the room
+        """
+
+        if room not in self._flow_fields:
+            self._flow_fields[room] = build_flow_field(self.nav_graph, [tile for collumn in room.room_tile_layout for tile in collumn])
+        return self._flow_fields[room]
+
+    def send_crewmates_to_room(self, crewmates: list[Crewmate], room: Room) -> list[Crewmate]:
+        """
+        Send a group of crewmates to a room, every crewmate follows the room's flow field
+        and then walks to its own free tile inside the room.
+        :param crewmates: list[modules.Crewmate] - the crewmates to send
+        :param room: modules.Room - the target room
+        :return list[modules.Crewmate] - the crewmates that were sent
+        """
+
+        field = self.get_flow_field(room)
+        free_tiles = [
+            tile for x, collumn in enumerate(room.room_tile_layout) for y, tile in enumerate(collumn)
+            if room.room_layout[x][y] == 1 and not tile.occupied and not tile.selected
+            ]
+        sent = []
+
+        for crewmate in crewmates:
+            start_tile = crewmate.occupied_tile
+            if len(free_tiles) == 0:
                 break
+            if start_tile is None or start_tile not in field:
+                continue
+
+            # follow the field until the room is reached
+            path = [start_tile]
+            while field[path[-1]] is not None:
+                path.append(field[path[-1]])
+
+            # then walk to the closest free tile that can be reached from the entry point
+            for end_tile in sorted(free_tiles, key=lambda tile: self.tile_distance(tile, path[-1])):
+                inner_path = room.get_inner_path(path[-1], end_tile)
+                if inner_path is not None:
+                    break
+            else:
+                continue
+            free_tiles.remove(end_tile)
+
+            crewmate.move_to_tile(end_tile, path + inner_path[1:])
+            sent.append(crewmate)
+
+        return sent
+
+    def shutdown(self) -> None:
+        """Stop the ship's background work, called once the ship is removed from the game."""
+        if self._path_service is not None:
+            self._path_service.shutdown()
+            self._path_service = None
 
-        # append a path from door to end_tile
-        relative_path = astar_pathfinding(curr_room.room_layout, start_tile.pos, end_tile.pos)
+    def build_spatial_index(self) -> None:
+        """Rebuild the ship space index of the rooms, tiles, upgrade slots, doors and crewmates."""
+        self.sprite_index.clear()
+        self._spatial_index_dirty = False
 
-        for pos in relative_path:
-            result_path.append(curr_room.room_tile_layout[pos[0]][pos[1]])
+        for room in self.rooms:
+            self.index_sprite(room)
+            for sprite in room.sprites():
+                self.index_sprite(sprite)
+        for door in self.doors:
+            self.index_sprite(door)
+        for crewmate in self.crewmates:
+            self.index_sprite(crewmate)
 
-        return result_path
+    def index_sprite(self, sprite: Union[pg.sprite.Sprite, Room]) -> None:
+        """
+        Add a sprite (or room) to the spatial index or update it after it moved inside the ship.
+        :param sprite: Union[pg.sprite.Sprite, Room] - the sprite, indexed by its ship space rect
+        """
+        if self._spatial_index_dirty: # the sprite is picked up when the index is rebuilt
+            return
+
+        self.sprite_index.move(sprite, sprite.rect)
+
+    def sprites_at(self, pos: tuple[int, int], kind: type = None, hitbox: bool = False) -> list:
+        """
+        Return the indexed sprites (and rooms) under a point.
+        :param pos: tuple[int, int] - the point
+        :param kind: type - only return instances of this type (optional)
+        :param hitbox: bool - the point is in screen space (hitboxes) instead of ship space
+        """
+        if self._spatial_index_dirty:
+            self.build_spatial_index()
+
+        found = self.sprite_index.query_point(self.transform.from_screen(pos) if hitbox else pos)
+        return found if kind is None else [sprite for sprite in found if isinstance(sprite, kind)]
+
+    def sprites_in(self, rect: pg.Rect, kind: type = None, hitbox: bool = False) -> list:
+        """
+        Return the indexed sprites (and rooms) overlapping a rect.
+        :param rect: pg.Rect - the area to search
+        :param kind: type - only return instances of this type (optional)
+        :param hitbox: bool - the rect is in screen space (hitboxes) instead of ship space
+        """
+        if self._spatial_index_dirty:
+            self.build_spatial_index()
+
+        found = self.sprite_index.query_rect(self.transform.from_screen_rect(rect) if hitbox else rect)
+        return found if kind is None else [sprite for sprite in found if isinstance(sprite, kind)]
+
+    def system_power_changed(self, room: Room, change: int) -> None:
+        """
+        Update the cached power usage after the power of a room changed.
+        :param room: Room - the room that changed
+        :param change: int - the change of the room's power
+        """
+        if self.installed_systems.get(room.role) is room:
+            self._power_usage += change
+
+    def system_health_changed(self, room: Room, change: int) -> None:
+        """
+        Update the cached system health before the health points of a room change.
+        :param room: Room - the room that is changing
+        :param change: int - the change of the room's health points
+        """
+        if self.installed_systems.get(room.role) is not room:
+            return
+
+        self._system_health += change
+        if room.health_points + change < room.max_power:
+            self._damaged_systems[room] = None
+        else:
+            self._damaged_systems.pop(room, None)
+
+    def upgrade_placed(self, slot: UpgradeSlot) -> None:
+        """
+        Add a newly placed upgrade slot to the typed slot lists.
+        :param slot: UpgradeSlot - the placed slot
+        """
+        if isinstance(slot, Weapon):
+            self._weapons.append(slot)
+        elif isinstance(slot, Thruster):
+            self._thrusters.append(slot)
+        elif type(slot) is UpgradeSlot:
+            self._empty_slots.append(slot)
+
+    def _count_registry(self) -> dict:
+        """Recount the power, health and upgrade registry from the rooms."""
+        slots = [slot for room in self.rooms for slot in room.upgrade_slots.values()]
+        return {
+            "power_usage": sum(room.power for room in self.installed_systems.values()),
+            "system_health": sum(room.health_points for room in self.installed_systems.values()),
+            "damaged_systems": {room: None for room in self.installed_systems.values() if room.needs_repair},
+            "weapons": [slot for slot in slots if isinstance(slot, Weapon)],
+            "thrusters": [slot for slot in slots if isinstance(slot, Thruster)],
+            "empty_slots": [slot for slot in slots if type(slot) is UpgradeSlot],
+        }
+
+    def _load_registry(self, registry: dict) -> None:
+        self._power_usage = registry["power_usage"]
+        self._system_health = registry["system_health"]
+        self._damaged_systems = registry["damaged_systems"]
+        self._weapons = registry["weapons"]
+        self._thrusters = registry["thrusters"]
+        self._empty_slots = registry["empty_slots"]
+
+    def _verify_registry(self) -> None:
+        """Compare the cached registry with a full recount (only with the verify_ship_registry debug option)."""
+        if not GLOBAL_DEBUG_OPTIONS["verify_ship_registry"]:
+            return
+
+        cached = {
+            "power_usage": self._power_usage,
+            "system_health": self._system_health,
+            "damaged_systems": self._damaged_systems,
+            "weapons": self._weapons,
+            "thrusters": self._thrusters,
+            "empty_slots": self._empty_slots,
+        }
+        counted = self._count_registry()
+        for key, value in counted.items():
+            if cached[key] != value:
+                print(f"Ship registry out of sync: {key} is {cached[key]}, recounted {value}!")
+        self._load_registry(counted)
+
+    def get_tile_at(self, pos: tuple[int, int]) -> Union[Tile, None]:
+        """
+        Return the walkable tile under a position in ship space.
+        :param pos: tuple[int, int] - the position to test
+        :return: Union[Tile, None] - the tile or None if there is no walkable tile there
+        """
+        cell = self.grid.cell_at((0, 0), pos)
+        return self.grid.tiles[cell] if cell is not None else None
+
+    @staticmethod
+    def tile_distance(tile1: Tile, tile2: Tile) -> float:
+        """Manhattan distance between two tiles of the same ship, in tiles."""
+        return (abs(tile1.rect.x - tile2.rect.x) + abs(tile1.rect.y - tile2.rect.y)) / Tile.SIZE
 
     def dev_draw_room_hitboxes(self, screen: pg.surface.Surface) -> None:
         """
@@ -524,38 +923,49 @@ class Spaceship:
 
         return
 
+    @property
+    def nav_graph(self) -> dict[Tile, list[Tile]]:
+        """Return the navigation graph of the ship, building it if needed."""
+        if self._nav_graph is None:
+            self.build_nav_graph()
+        return self._nav_graph
+
+    @property
+    def nav_step(self) -> int:
+        """Return the current cooperative pathing step, one step being the time a crewmate needs to walk a tile."""
+        return int(self._nav_time * Crewmate.movement_speed // Tile.SIZE)
+
+    @property
+    def path_service(self) -> PathService:
+        """Return the ship's background path service, starting it if needed."""
+        if self._path_service is None:
+            self._path_service = PathService()
+        return self._path_service
+
+    @property
+    def routing_table(self) -> RoutingTable:
+        """Return the next-hop routing table of the ship, creating it if needed."""
+        if self._routing_table is None:
+            self._routing_table = RoutingTable(self.nav_graph)
+        return self._routing_table
+
     @property
     def empty_upgrade_slots(self) -> Union[list[UpgradeSlot], None]:
         """Return a list of all the empty upgrade slots on the ship."""
-        empty_slots = []
-        for room in self.rooms:
-            room_slots = room.upgrade_slots
-            if room_slots is not None:
-                empty_slots.append(room_slots)
-            
-        return empty_slots if len(empty_slots) > 0 else None
+        self._verify_registry()
+        return self._empty_slots if len(self._empty_slots) > 0 else None
 
     @property
     def weapons(self) -> list[Weapon]:
-        """Return a list of all the weapons on the ship."""
-        weapons = []
-        for room in self.rooms:
-            room_weapons = room.weapons
-            if room_weapons is not None:
-                weapons = weapons + room_weapons
-            
-        return weapons
+        """Return a list of all the weapons on the ship (shared with the registry, don't modify it)."""
+        self._verify_registry()
+        return self._weapons
     
     @property
     def thrusters(self) -> Union[list[Thruster], None]:
         """Return a list of all the thrusters on the ship."""
-        thrusters = []
-        for room in self.rooms:
-            room_thrusters = room.thrusters
-            if room_thrusters is not None:
-                thrusters.append(room_thrusters)
-            
-        return thrusters if len(thrusters) > 0 else None
+        self._verify_registry()
+        return self._thrusters if len(self._thrusters) > 0 else None
     
     @property
     def max_power(self) -> int:
@@ -566,11 +976,20 @@ class Spaceship:
     @property
     def current_power(self) -> int:
         """Return the current power usage of the ship."""
+        self._verify_registry()
+        return self._power_usage
+
+    @property
+    def system_health(self) -> int:
+        """Return the summed health points of the installed systems."""
+        self._verify_registry()
+        return self._system_health
 
-        power_level = 0
-        for system in self.installed_systems:
-            power_level += self.installed_systems[system].power
-        return power_level
+    @property
+    def damaged_systems(self) -> list[Room]:
+        """Return the installed systems that need repair."""
+        self._verify_registry()
+        return list(self._damaged_systems)
 
     @property
     def usable_power(self) -> int:
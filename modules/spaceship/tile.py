@@ -10,14 +10,15 @@ from modules.resources import textures
 class Tile(pg.sprite.Sprite):
     # public
     pos: tuple[int,int]
-    rect: pg.Rect
-    hitbox: pg.Rect
-    image: pg.Surface
+    rect: pg.Rect # in ship space
+    image: pg.Surface # shared by every tile, never draw on it
     parent_room: Room
 
+    # width and height of a tile in pixels
+    SIZE = 32
+
     # private
     _occupied: bool
-    _selected: bool
 
     def __init__(self, 
                  parent_pos: tuple, 
@@ -26,19 +27,21 @@ class Tile(pg.sprite.Sprite):
                  ) -> None:
         pg.sprite.Sprite.__init__(self, sprite_group)
         
-        self.image = textures["tile_default"].copy()
+        self.image = textures["tile_default"]
         self.rect = self.image.get_rect()
         self.parent_room = sprite_group
 
         self.pos = pos
-        self.rect.x = parent_pos[0] + pos[0] * 32
-        self.rect.y = parent_pos[1] + pos[1] * 32
-
-        self.hitbox = self.rect.copy()
+        self.rect.x = parent_pos[0] + pos[0] * Tile.SIZE
+        self.rect.y = parent_pos[1] + pos[1] * Tile.SIZE
 
         self._occupied = False
-        self._selected = False
     
+    @property
+    def hitbox(self) -> pg.Rect:
+        """The tile's rect on screen."""
+        return self.parent_room.parent.transform.hitbox_of(self)
+
     @property
     def occupied(self) -> bool:
         """Returns True or False depending on if the tile is occupied by a crewmate."""
@@ -49,6 +52,7 @@ class Tile(pg.sprite.Sprite):
         """Sets the tile's occupied status."""
 
         self._occupied = value
+        self.parent_room.parent.grid.set_occupied(self, value)
         
         # if occupied set to true, set selected to false
         if value:
@@ -57,15 +61,17 @@ class Tile(pg.sprite.Sprite):
     @property
     def selected(self) -> bool:
         """Returns True or False depending on if the tile is selected."""
-        return self._selected
+        return self in self.parent_room.parent.selected_tiles
     
     @selected.setter
     def selected(self, value: bool) -> None:
-        """Sets the tile's selected status."""
+        """Sets the tile's selected status, the destination marker is drawn by the room over the shared texture."""
 
-        if value and self._selected!= value: # apply the selected texture only once
-            self.image.blit(textures["crewmates"]["destination"].image, (0,0))
-        elif not value:
-            self.image = textures["tile_default"].copy()
-        
-        self._selected = value
\ No newline at end of file
+        if value == self.selected:
+            return
+
+        if value:
+            self.parent_room.parent.selected_tiles.add(self)
+        else:
+            self.parent_room.parent.selected_tiles.discard(self)
+        self.parent_room.invalidate()
\ No newline at end of file
@@ -7,6 +7,7 @@ if TYPE_CHECKING:
 
 from modules.resources import textures, weapons
 from modules.projectile import Projectile
+from modules.misc.transform_cache import transform_cache
 
 class UpgradeSlot(pg.sprite.Sprite):
     # public
@@ -14,7 +15,8 @@ class UpgradeSlot(pg.sprite.Sprite):
     orientation: Literal["top", "right", "bottom", "left"]
     image: pg.Surface
     pos: tuple[int, int]
-    rect: pg.Rect
+    rect: pg.Rect # in ship space
+    parent_room: Room
 
     def __init__(self, 
                  pos: tuple[int, int],
@@ -24,6 +26,7 @@ class UpgradeSlot(pg.sprite.Sprite):
                  purpose: str = None
                  ) -> None:
         pg.sprite.Sprite.__init__(self, sprite_group)
+        self.parent_room = sprite_group
 
         if purpose is not None:
             # purpose is a string that describes only the upgrade slot
@@ -49,18 +52,18 @@ class UpgradeSlot(pg.sprite.Sprite):
 
     def change_texture(self, texture: pg.Surface) -> None:
         """
-        Rotate the texture based on the orientation of the upgrade slot.
+        Rotate the texture based on the orientation of the upgrade slot, the turned textures are cached.
         :param texture: The texture to be rotated.
         """
 
         if self.orientation == "top":
             self.image = texture
         elif self.orientation == "right":
-            self.image = pg.transform.rotate(texture, 270)
+            self.image = transform_cache.rotate(texture, 270)
         elif self.orientation == "bottom":
-            self.image = pg.transform.flip(texture, False, True)
+            self.image = transform_cache.flip(texture, False, True)
         elif self.orientation == "left":
-            self.image = pg.transform.rotate(texture, 90)
+            self.image = transform_cache.rotate(texture, 90)
 
 class Weapon(UpgradeSlot):
     # public
@@ -178,7 +181,7 @@ class Weapon(UpgradeSlot):
 
         for i in range(self.volley_shots):
             delay = self.volley_delay * i
-            projectile = Projectile(self.rect.center, first_pos, self.projectile_type, 1, 300, (255,0,0), 15, 3, delay, target_room, not target_room.parent.enemy)
+            projectile = Projectile(self.parent_room.parent.transform.to_draw(self.rect.center), first_pos, self.projectile_type, 1, 300, (255,0,0), 15, 3, delay, target_room, not target_room.parent.enemy)
             self.projectile_queue.append(projectile)
 
         return self.projectile_queue
@@ -248,6 +251,7 @@ class Shield(UpgradeSlot):
     charge_time: int
     charge_change: int
     # private
+    _scaled_cache: dict[tuple[int, int], tuple[pg.Surface, pg.mask.Mask]] = {} # shared by all shields, keyed by size
 
     def __init__(self, 
                  pos: tuple[int, int], 
@@ -287,14 +291,20 @@ class Shield(UpgradeSlot):
         width = ship_corners[1][0] - ship_corners[0][0]
         height = ship_corners[1][1] - ship_corners[0][1]
         
-        self.shield_sprite.image = pg.transform.scale(self.shield_sprite.image, (width+144, height+144))
+        # every shield uses the same texture, so ships of the same size share the scaled image and its mask
+        size = (width+144, height+144)
+        if size not in Shield._scaled_cache:
+            image = pg.transform.scale(self.shield_sprite.image, size)
+            Shield._scaled_cache[size] = (image, pg.mask.from_surface(image, threshold=0))
+
+        self.shield_sprite.image, self.shield_mask = Shield._scaled_cache[size]
         self.shield_sprite.rect = self.shield_sprite.image.get_rect(center=ship_center)
-        self.shield_mask = pg.mask.from_surface(self.shield_sprite.image, threshold=0)
         # TODO: above funtion's threshold parameter creates a mask that doesn't always match the sprite's alpha channel
         
     def draw(self, screen: pg.Surface) -> None:
         if hasattr(self, "shield_sprite") and self.charge > 0:
-            screen.blit(self.shield_sprite.image, self.shield_sprite.rect)
+            view = self.parent_room.parent.transform
+            screen.blit(view.view_image(self.shield_sprite.image), view.to_view_rect(self.shield_sprite.rect))
 
             # uncomment to draw the shield's mask
             #screen.blit(self.shield_mask.to_surface(setcolor=(0,255,0,125,)), self.shield_sprite.rect.topleft)
@@ -8,6 +8,7 @@ if TYPE_CHECKING:
 from modules.player import Player
 from modules.spaceship.room import Room
 from modules.resources import textures, get_font, button_palletes, systems
+from modules.misc.text_cache import text_cache
 
 class InterfaceController(pg.sprite.Group):
     # public
@@ -15,6 +16,9 @@ class InterfaceController(pg.sprite.Group):
     resolution: tuple[int, int]
     ratio: float
     enemy_ui_active: bool
+    dirty_rects: list[pg.Rect] # the areas of the surface that were redrawn in the last update
+    enemy_hud_rect: pg.Rect # the area of the enemy's view covered by its hud
+    enemy_hud_dirty: bool # if the enemy hud changed in the last update
 
     # private
     _player: Player
@@ -23,6 +27,9 @@ class InterfaceController(pg.sprite.Group):
 
     _enemy: Enemy
 
+    _section_states: dict[str, tuple] # the values shown by each section of the interface when it was last drawn
+    _section_areas: dict[str, pg.Rect] # the area of the surface each section was drawn on
+
     _color_on = (100, 255, 98)
     _color_off = (255, 255, 255)
     _power_bar_size = (32, 8)
@@ -57,6 +64,7 @@ class InterfaceController(pg.sprite.Group):
     _resource_icons: list[ResourceIcon]
 
     _enemy_hud_surface: pg.Surface
+    _enemy_hud_state: Union[tuple, None] # the values shown by the enemy hud surface
     _enemy_hud_font: pg.font.Font
     _enemy_hull_label: pg.Surface
     _enemy_shields_label: pg.Surface
@@ -68,6 +76,9 @@ class InterfaceController(pg.sprite.Group):
         self.resolution = resolution
         self.ratio = ratio
         self._player = player
+        self.dirty_rects = []
+        self._section_states = {}
+        self._section_areas = {}
 
         self._enemy = None
         self.enemy_ui_active = False
@@ -165,24 +176,31 @@ class InterfaceController(pg.sprite.Group):
         self._resource_icons.append(ResourceIcon(self._player, (384, 0), "scrap", 24))
 
         # Enemy hud elements
-        self._enemy_hud_surface = pg.Surface((self.resolution[0] - (1-ratio), 128), pg.SRCALPHA)
+        self.enemy_hud_rect = pg.Rect(0, 0, self.resolution[0] * (1-self.ratio), 196)
+        self.enemy_hud_dirty = False
+        self._enemy_hud_surface = pg.Surface(self.enemy_hud_rect.size, pg.SRCALPHA)
+        self._enemy_hud_state = None
         self._enemy_hud_font = get_font("arial", 16)
-        self._enemy_hull_label = self._enemy_hud_font.render("HULL", True, (255,255,255))
+        self._enemy_hull_label = text_cache.render(self._enemy_hud_font, "HULL", True, (255,255,255)).copy() # gets a colour key
         self._enemy_hull_label.set_colorkey((0,0,0), pg.RLEACCEL)
-        self._enemy_shields_label = self._enemy_hud_font.render("SHIELDS", True, (255,255,255))
+        self._enemy_shields_label = text_cache.render(self._enemy_hud_font, "SHIELDS", True, (255,255,255)).copy()
         self._enemy_shields_label.set_colorkey((0,0,0), pg.RLEACCEL)
 
-    def _draw_power(self) -> None:
-        """Draws power bar interface on screen."""
+    def _draw_power(self) -> pg.Rect:
+        """
+        Draws power bar interface on screen.
+        :return: pg.Rect - the area that was drawn on
+        """
         curr_power = self._player_power_max - self._player_power_current
+        drawn = []
 
         # draw ship's power bar
         coords = (16, self.resolution[1]-32)
         for i in range(0, self._player_power_max):
             if i < curr_power: # draw full bar
-                pg.draw.rect(self.surface, self._color_on, (coords[0], coords[1] - i * self._power_bar_gap, self._power_bar_size[0], self._power_bar_size[1]))
+                drawn.append(pg.draw.rect(self.surface, self._color_on, (coords[0], coords[1] - i * self._power_bar_gap, self._power_bar_size[0], self._power_bar_size[1])))
             else: # draw empty bar
-                pg.draw.rect(self.surface, self._color_off, (coords[0], coords[1] - i * self._power_bar_gap, self._power_bar_size[0], self._power_bar_size[1]), 1)
+                drawn.append(pg.draw.rect(self.surface, self._color_off, (coords[0], coords[1] - i * self._power_bar_gap, self._power_bar_size[0], self._power_bar_size[1]), 1))
 
         # draw every system's power bar
         for index, system_name in enumerate(self._player.installed_systems):
@@ -195,22 +213,30 @@ class InterfaceController(pg.sprite.Group):
             coords = (coords[0] + (self._power_system_bar_icon_size[0]//2 - self._power_system_bar_size[0]//2), coords[1] - (self._power_system_bar_icon_size[1]//2))
             for power_level in range(0, system.max_power):
                 if  power_level < system_power: # draw full bar
-                    pg.draw.rect(self.surface, self._color_on, (coords[0], coords[1] - power_level*self._power_system_bar_gap, self._power_system_bar_size[0], self._power_system_bar_size[1]))
+                    drawn.append(pg.draw.rect(self.surface, self._color_on, (coords[0], coords[1] - power_level*self._power_system_bar_gap, self._power_system_bar_size[0], self._power_system_bar_size[1])))
                 else: # draw empty bar
-                    pg.draw.rect(self.surface, self._color_off, (coords[0], coords[1] - power_level*self._power_system_bar_gap, self._power_system_bar_size[0], self._power_system_bar_size[1]), 2)
+                    drawn.append(pg.draw.rect(self.surface, self._color_off, (coords[0], coords[1] - power_level*self._power_system_bar_gap, self._power_system_bar_size[0], self._power_system_bar_size[1]), 2))
             
             # draw damaged and repairing power bars
             coords = (coords[0], coords[1] - power_level*self._power_system_bar_gap)
             if system.needs_repair: # damaged system
                 for power_level in range(0, system.max_power - system.health_points):
-                    pg.draw.rect(self.surface, (255,0,0), (coords[0], coords[1] + power_level*self._power_system_bar_gap, self._power_system_bar_size[0], self._power_system_bar_size[1]))
+                    drawn.append(pg.draw.rect(self.surface, (255,0,0), (coords[0], coords[1] + power_level*self._power_system_bar_gap, self._power_system_bar_size[0], self._power_system_bar_size[1])))
             
                 if system.repair_progress > 0:
-                    pg.draw.rect(self.surface, (255,200,0), (coords[0], coords[1] + power_level*self._power_system_bar_gap, self._power_system_bar_size[0] * system.repair_progress, self._power_system_bar_size[1]))
-        return
+                    drawn.append(pg.draw.rect(self.surface, (255,200,0), (coords[0], coords[1] + power_level*self._power_system_bar_gap, self._power_system_bar_size[0] * system.repair_progress, self._power_system_bar_size[1])))
+
+        # the system icons are drawn over their bars
+        for power_icon in self._installed_systems_icon_bar:
+            drawn.append(self.surface.blit(power_icon.image, power_icon.rect))
+
+        return drawn[0].unionall(drawn[1:])
     
-    def _draw_weapons(self) -> None:
-        """Draws the weapons interface on the screen"""
+    def _draw_weapons(self) -> pg.Rect:
+        """
+        Draws the weapons interface on the screen
+        :return: pg.Rect - the area that was drawn on
+        """
         
         self._wbar_surface.fill((0,0,0))
         self._autofire_button.draw(self._wbar_surface)
@@ -238,9 +264,13 @@ class InterfaceController(pg.sprite.Group):
             ],
             2
         )
-        self.surface.blit(self._wbar_surface, self._wbar_coords)
+        return self.surface.blit(self._wbar_surface, self._wbar_coords)
     
-    def _draw_status_bar(self) -> None:
+    def _draw_status_bar(self) -> pg.Rect:
+        """
+        Draws the hull, resources, shields, evade and oxygen of the player.
+        :return: pg.Rect - the area that was drawn on
+        """
         self._status_surface.fill((0,0,0))
         
         self._status_surface.blit(textures["ui_hull_bar"][f"top_hull_{'white' if self._player.hull_hp > 10 else 'red'}"].image, (0,0))
@@ -253,19 +283,38 @@ class InterfaceController(pg.sprite.Group):
 
         self._status_bar_shields.draw(self._status_surface)
 
-        self.surface.blit(self._status_surface, self._status_bar_coords)
+        drawn = [self.surface.blit(self._status_surface, self._status_bar_coords)]
 
         # draw evade and oxygen bar
-        evade = self._status_bar_evade_oxygen_font.render(f"{self._player.evade_stat} %", True, (255,255,255))
-        oxygen = self._status_bar_evade_oxygen_font.render(f"{self._player.oxygen} %", True, (255,255,255))
+        evade = text_cache.render(self._status_bar_evade_oxygen_font, f"{self._player.evade_stat} %", True, (255,255,255))
+        oxygen = text_cache.render(self._status_bar_evade_oxygen_font, f"{self._player.oxygen} %", True, (255,255,255))
 
-        self.surface.blit(self._status_bar_evade_oxygen.image, (self._status_bar_coords[0], self._status_bar_coords[1] + 96))
-        self.surface.blit(evade, (self._status_bar_coords[0] + 40 + evade.get_width()//2, self._status_bar_coords[1] + 96 + 8))
-        self.surface.blit(oxygen, (self._status_bar_coords[0] + 36 + oxygen.get_width()//2, self._status_bar_coords[1] + 96 + 30))
+        drawn.append(self.surface.blit(self._status_bar_evade_oxygen.image, (self._status_bar_coords[0], self._status_bar_coords[1] + 96)))
+        drawn.append(self.surface.blit(evade, (self._status_bar_coords[0] + 40 + evade.get_width()//2, self._status_bar_coords[1] + 96 + 8)))
+        drawn.append(self.surface.blit(oxygen, (self._status_bar_coords[0] + 36 + oxygen.get_width()//2, self._status_bar_coords[1] + 96 + 30)))
 
         del evade, oxygen
 
-        return
+        return drawn[0].unionall(drawn[1:])
+
+    def _redraw_section(self, name: str, state: tuple, draw_func: callable) -> None:
+        """
+        Redraw a section of the interface if the values it shows changed since it was last drawn.
+        The sections don't overlap, so a section is cleared and redrawn on its own.
+        :param name: str - the name of the section
+        :param state: tuple - the values the section shows
+        :param draw_func: callable - draws the section on the surface and returns the area it drew on
+        """
+        if self._section_states.get(name) == state:
+            return
+        self._section_states[name] = state
+
+        old_area = self._section_areas.get(name)
+        if old_area is not None:
+            self.surface.fill((0,0,0,0), old_area)
+
+        area = self._section_areas[name] = draw_func()
+        self.dirty_rects.append(area if old_area is None else area.union(old_area))
 
     def mouse_clicked(self, mouse_pos: tuple[int, int], mouse_clicked: tuple[int, int, int]) -> None:
         """
@@ -304,23 +353,36 @@ class InterfaceController(pg.sprite.Group):
         """
 
         self._player_power_current = self._player.current_power
-        self.surface = pg.Surface(self.resolution, pg.SRCALPHA)
-
-        # draw texture sprites
-        for sprite in self.sprites():
-            sprite.draw(self.surface)
+        self.dirty_rects = []
 
         self._installed_systems_icon_bar.update()
-
-        self._draw_power()
-        self._installed_systems_icon_bar.draw(self.surface)
-
         for wicon in self._weapon_icons:
             wicon.update()
 
-        self._draw_weapons()
-
-        self._draw_status_bar()
+        # the surface is kept between frames, a section is only redrawn when the values it shows change
+        systems = self._player.installed_systems.values()
+        self._redraw_section("power", (
+            self._player_power_max,
+            self._player_power_current,
+            tuple((system.power, system.max_power, system.needs_repair, system.health_points, system.repair_progress) for system in systems),
+            tuple(power_icon.image for power_icon in self._installed_systems_icon_bar),
+            ), self._draw_power)
+        self._redraw_section("weapons", (
+            tuple(wicon.get_state() for wicon in self._weapon_icons),
+            self._autofire_button.get_state(),
+            ), self._draw_weapons)
+        self._redraw_section("status", (
+            self._player.hull_hp,
+            tuple(icon.get_state() for icon in self._resource_icons),
+            self._status_bar_shields.get_state(),
+            self._player.evade_stat,
+            self._player.oxygen,
+            ), self._draw_status_bar)
+
+        self.enemy_hud_dirty = False
+        if self.enemy_ui_active and self._enemy is not None:
+            state = (self._enemy.hull_hp, self._enemy_shields_bar.get_state())
+            self.enemy_hud_dirty = state != self._enemy_hud_state
 
     def draw(self, screen: pg.Surface) -> None:
         """
@@ -331,33 +393,42 @@ class InterfaceController(pg.sprite.Group):
         screen.blit(self.surface, (0,0), special_flags=pg.BLEND_MAX)
         # BLEND_MAX make sure the ui is drawn on top of everything else, while still being transparent
 
-    def draw_enemy_interface(self, screen: pg.Surface) -> None:
+    def draw_enemy_interface(self, screen: pg.Surface, pos: tuple[int, int] = (0,0)) -> None:
         """
         Draw the enemy interface to the provided surface.
         :param screen: pg.surface.Surface - the surface to draw the enemy interface on
+        :param pos: tuple[int, int] - the position of the enemy's view on the surface
         """
 
-        self._enemy_hud_surface = pg.Surface((self.resolution[0] * (1-self.ratio), 196), pg.SRCALPHA)
         if self._enemy is None:
             return
 
         coords = [32,16]
+        # the labels and the shields are drawn on the hud surface again only when they change
+        state = (self._enemy.hull_hp, self._enemy_shields_bar.get_state())
+        redraw = state != self._enemy_hud_state
+        self._enemy_hud_state = state
+        if redraw:
+            self._enemy_hud_surface.fill((0,0,0,0))
+
         # drawing hull label and icons
-        self._enemy_hud_surface.blit(self._enemy_hull_label, coords)
+        if redraw:
+            self._enemy_hud_surface.blit(self._enemy_hull_label, coords)
+        hull_mask = self._status_bar_enemy_hull_mask
         self._status_bar_enemy_hull_mask, self._status_bar_enemy_prev_hp = self.update_hull_bar(self.enemy_ship.hull_hp, self._status_bar_enemy_prev_hp, self._status_bar_enemy_hull_mask, True)
-        self._status_bar_enemy_hull_mask.convert_alpha()
-        self._status_bar_enemy_hull_mask.set_colorkey((0,0,0), pg.RLEACCEL)
-        screen.blit(self._status_bar_enemy_hull_mask, (coords[0], coords[1] - 8))
+        if self._status_bar_enemy_hull_mask is not hull_mask or redraw:
+            self._status_bar_enemy_hull_mask.set_colorkey((0,0,0), pg.RLEACCEL)
+        screen.blit(self._status_bar_enemy_hull_mask, (pos[0] + coords[0], pos[1] + coords[1] - 8))
 
         # drawing shield label and icons
-        if self._enemy.installed_shield is not None:
+        if self._enemy.installed_shield is not None and redraw:
             coords[1] += 40
             self._enemy_hud_surface.blit(self._enemy_shields_label, coords)
             coords[1] += self._enemy_shields_label.get_height() - 4
             self._enemy_shields_bar.pos = coords
             self._enemy_shields_bar.draw(self._enemy_hud_surface)
 
-        screen.blit(self._enemy_hud_surface, (0,0), special_flags=pg.BLEND_RGBA_MAX)
+        screen.blit(self._enemy_hud_surface, pos, special_flags=pg.BLEND_RGBA_MAX)
 
         return
 
@@ -410,6 +481,7 @@ class InterfaceController(pg.sprite.Group):
         self.enemy_ui_active = True
         self._enemy_shields_bar = ShieldBar(enemy.installed_shield, (0,0), True)
         self._enemy = enemy
+        self._enemy_hud_state = None
 
     @enemy_ship.deleter
     def enemy_ship(self) -> None:
@@ -427,6 +499,7 @@ class PowerIcon(pg.sprite.Sprite):
 
     # private
     _room_obj: Room
+    _powered: Union[bool, None] # the state shown by the image
 
     def __init__(self, 
                  powered: bool,
@@ -442,10 +515,15 @@ class PowerIcon(pg.sprite.Sprite):
         self.image = self.icon.image
         self.rect = self.image.get_rect(center=(coords[0] + size[0]//2, coords[1] + size[1]//2))
         self.hitbox = pg.Rect(coords, size)
+        self._powered = None
 
     def update(self) -> None:
         """Update the power icon based on the power level of the system."""
         power = 0 if self._room_obj.health_points == 0 else self._room_obj.power
+        if (power > 0) == self._powered: # the image is only replaced when the system is turned on or off
+            return
+        self._powered = power > 0
+
         self.icon = textures["system_icons"][self.system_name]["green" if power>0 else "grey"]
         self.image = self.icon.image.convert_alpha()
 
@@ -490,7 +568,7 @@ class WeaponIcon():
         self._player = player
         self._weapon = weapon
         self._font = get_font("arial", 16)
-        self._label = self._font.render(str(weapon), True, (255,255,255))
+        self._label = text_cache.render(self._font, str(weapon), True, (255,255,255))
 
         self.rect = pg.Rect(pos, size)
         self.hitbox = pg.Rect(real_pos, size)
@@ -506,6 +584,10 @@ class WeaponIcon():
 
         self.selected = True if self._player.selected_weapon == self._weapon else False
 
+    def get_state(self) -> tuple:
+        """Return the values the icon shows, it has to be redrawn when they change."""
+        return (self.state, self.hovering, self.selected)
+
     def draw(self, screen: pg.surface.Surface) -> None:
         color = self._colors[self.state]
         if self.hovering:
@@ -589,23 +671,26 @@ class ResourceIcon():
         self._font = get_font("num_font", font_size)
 
         return 
-    
-    def draw(self, screen: pg.surface.Surface) -> None:
-        """
-        Draw the resource icon on the given surface.
-        :param screen: pg.surface.Surface - the surface to draw on
-        """
-        resource_count = 0
 
+    def get_state(self) -> int:
+        """Return the resource count the icon shows, it has to be redrawn when it changes."""
         match self.role:
             case "fuel":
-                resource_count = self._player.fuel
+                return self._player.fuel
             case "missile":
-                resource_count = self._player.missles
+                return self._player.missles
             case "drone_parts":
-                resource_count = self._player.drones
+                return self._player.drones
             case "scrap":
-                resource_count = self._player.scrap
+                return self._player.scrap
+        return 0
+    
+    def draw(self, screen: pg.surface.Surface) -> None:
+        """
+        Draw the resource icon on the given surface.
+        :param screen: pg.surface.Surface - the surface to draw on
+        """
+        resource_count = self.get_state()
         
         curr_color = "white" if resource_count > 8 else "red"
         curr_text_color = (255,255,255) if resource_count > 8 else (255,0,0)
@@ -613,8 +698,8 @@ class ResourceIcon():
         # draw the icon
         screen.blit(self._icon[curr_color].image, self._icon[curr_color].rect.topleft)
 
-        # draw the resource count
-        label = self._font.render(str(resource_count), True, curr_text_color)
+        # draw the resource count, the counters change often so they're put together from cached digits
+        label = text_cache.render_number(self._font, resource_count, True, curr_text_color)
         label_center = (self._icon[curr_color].rect.centerx, self._icon[curr_color].rect.centery - label.get_height() // 2)
         
         screen.blit(label, label_center)
@@ -652,9 +737,19 @@ class ShieldBar():
 
         return
 
+    def get_state(self) -> tuple:
+        """Return the values the bar shows, it has to be redrawn when they change."""
+        if self._shield is None:
+            return ()
+
+        progress = 0
+        if self._shield.curr_charge > 0: # the width of the progress bar in pixels
+            progress = int(self._progress_bar.image.get_width() * self._shield.curr_charge / self._shield.charge_time)
+        return (self._shield.max_charge, self._shield.charge, self._shield.curr_charge > 0, progress)
+
     def draw(self, screen: pg.Surface) -> None:
         if hasattr(self, "_ui_top_shields_bar"):
-            self._ui_top_shields_bar.image = textures["ui_top_shields"]["on" if self._shield.max_charge>0 else "off"].image.copy()
+            self._ui_top_shields_bar.image = textures["ui_top_shields"]["on" if self._shield.max_charge>0 else "off"].image
             screen.blit(self._ui_top_shields_bar.image, self._ui_top_shields_bar.rect)
         if self._shield is None:
             return
@@ -721,7 +816,7 @@ class Button():
         if toggle_func is not None:
             self.toggle = toggle_func
 
-        temp_label = self._font.render(self.text, True, self._color_palette["label"][self.state])
+        temp_label = text_cache.render(self._font, self.text, True, self._color_palette["label"][self.state])
         temp_label_size = temp_label.get_size()
         size = (temp_label_size[0] + padding[0] + border_width, temp_label_size[1] + padding[1] + border_width)
         
@@ -736,12 +831,16 @@ class Button():
         self.hitbox.x += offset[0]
         self.hitbox.y += offset[1]
 
+    def get_state(self) -> tuple:
+        """Return the values the button shows, it has to be redrawn when they change."""
+        return (self.state, self.hovering)
+
     def draw(self, screen: pg.surface.Surface) -> None:
         state = f"{self.state}_hover" if self.hovering else self.state
         pg.draw.rect(screen, self._color_palette["background"][state], self.rect, 0, self._border_radius)
         pg.draw.rect(screen, self._color_palette["border"][state], self.rect, self._border_width, self._border_radius)
 
-        label = self._font.render(self.text, True, self._color_palette["label"][state])
+        label = text_cache.render(self._font, self.text, True, self._color_palette["label"][state])
         label_center = (self.rect.centerx - label.get_width() // 2, self.rect.centery - label.get_height() // 2)
 
         screen.blit(label, label_center)